@@ -0,0 +1,140 @@
+"""
+Hydra Bot Circuit Breaker
+Fail-fast guard and retry helper for external API calls
+"""
+
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+import httpx
+import openai
+from loguru import logger
+from tenacity import (
+    AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+)
+
+TRANSIENT_OPENAI_ERRORS = (
+    openai.APIConnectionError,  # Includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open"""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Timeouts, connection errors, 429s and 5xx are worth retrying; anything else is our fault"""
+    if isinstance(exc, (httpx.TransportError, *TRANSIENT_OPENAI_ERRORS)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Opens after repeated failures and lets a single trial call through once cooled down"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        failure_window: float = 30.0,
+        recovery_timeout: float = 20.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.recovery_timeout = recovery_timeout
+        self.failures = deque()
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.recovery_timeout:
+            return "open"
+        return "half_open"
+
+    def acquire(self) -> bool:
+        """Admit a call or raise CircuitOpenError; True means the call is the half-open trial"""
+        state = self.state
+        if state == "open" or (state == "half_open" and self.trial_in_flight):
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        if state == "half_open":
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def release(self, is_trial: bool, failed: bool):
+        """Record the outcome of a call admitted by acquire()"""
+        now = time.monotonic()
+
+        if is_trial:
+            # Only the trial call decides whether the circuit closes again
+            self.trial_in_flight = False
+            if failed:
+                self.opened_at = now
+            else:
+                self.opened_at = None
+                self.failures.clear()
+                logger.info(f"🟢 {self.name} circuit closed")
+            return
+
+        if self.opened_at is not None:
+            # Admitted before the circuit opened; too late to change its state
+            return
+
+        if not failed:
+            self.failures.clear()
+            return
+
+        self.failures.append(now)
+        while self.failures and now - self.failures[0] > self.failure_window:
+            self.failures.popleft()
+
+        if len(self.failures) >= self.failure_threshold:
+            self.opened_at = now
+            self.failures.clear()
+            logger.warning(f"🔴 {self.name} circuit opened after repeated failures")
+
+    @asynccontextmanager
+    async def guard(self):
+        """Run one call under the breaker"""
+        is_trial = self.acquire()
+        try:
+            yield
+        except Exception as e:
+            # A 4xx means the dependency answered; only outages count against it
+            self.release(is_trial, failed=is_transient_error(e))
+            raise
+        except BaseException:
+            # Cancelled mid-call: free the trial slot without judging the dependency
+            if is_trial:
+                self.trial_in_flight = False
+            raise
+        self.release(is_trial, failed=False)
+
+
+async def call_with_breaker(
+    breaker: CircuitBreaker,
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    **kwargs
+) -> Any:
+    """Call func through the breaker, retrying transient failures with exponential backoff"""
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.2, max=2),
+        retry=retry_if_exception(is_transient_error),
+        reraise=True
+    ):
+        with attempt:
+            async with breaker.guard():
+                return await func(*args, **kwargs)
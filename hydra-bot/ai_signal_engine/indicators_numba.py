@@ -0,0 +1,278 @@
+"""
+Hydra Bot Technical Indicator Kernels
+Numba-compiled RSI, MACD, Bollinger Bands and ATR over float64 NumPy arrays
+"""
+
+import math
+from typing import Any, Dict
+
+import numpy as np
+import polars as pl
+from numba import njit
+
+
+@njit(cache=True)
+def ema(values, span):
+    """Exponential moving average seeded with the first value"""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    alpha = 2.0 / (span + 1.0)
+    out[0] = values[0]
+    for i in range(1, n):
+        out[i] = alpha * values[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+@njit(cache=True)
+def rsi_wilder(close, n=14):
+    """Relative Strength Index using Wilder's smoothing"""
+    size = close.shape[0]
+    out = np.full(size, np.nan)
+    if size <= n:
+        return out
+
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, n + 1):
+        change = close[i] - close[i - 1]
+        if change > 0:
+            gain += change
+        else:
+            loss -= change
+    avg_gain = gain / n
+    avg_loss = loss / n
+    out[n] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    for i in range(n + 1, size):
+        change = close[i] - close[i - 1]
+        up = change if change > 0 else 0.0
+        down = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (n - 1) + up) / n
+        avg_loss = (avg_loss * (n - 1) + down) / n
+        out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return out
+
+
+@njit(cache=True)
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD line, signal line and histogram"""
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit(cache=True)
+def bbands(close, n=20, k=2.0):
+    """Bollinger Bands (lower, middle, upper) from running sums"""
+    size = close.shape[0]
+    lower = np.full(size, np.nan)
+    middle = np.full(size, np.nan)
+    upper = np.full(size, np.nan)
+
+    total = 0.0
+    total_sq = 0.0
+    for i in range(size):
+        total += close[i]
+        total_sq += close[i] * close[i]
+        if i >= n:
+            total -= close[i - n]
+            total_sq -= close[i - n] * close[i - n]
+        if i >= n - 1:
+            mean = total / n
+            var = total_sq / n - mean * mean
+            std = np.sqrt(var) if var > 0 else 0.0
+            middle[i] = mean
+            lower[i] = mean - k * std
+            upper[i] = mean + k * std
+
+    return lower, middle, upper
+
+
+@njit(cache=True)
+def atr(high, low, close, n=14):
+    """Average True Range using Wilder's smoothing"""
+    size = close.shape[0]
+    out = np.full(size, np.nan)
+    if size <= n:
+        return out
+
+    tr_sum = 0.0
+    for i in range(1, n + 1):
+        tr_sum += max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    avg = tr_sum / n
+    out[n] = avg
+
+    for i in range(n + 1, size):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        avg = (avg * (n - 1) + tr) / n
+        out[i] = avg
+
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def fused_indicators(close, high, low, rsi_n=14, fast=12, slow=26, signal=9,
+                     bb_n=20, bb_k=2.0, atr_n=14):
+    """RSI, MACD, Bollinger Bands and ATR computed in a single pass over the bars"""
+    size = close.shape[0]
+    rsi_out = np.full(size, np.nan)
+    macd_out = np.empty(size, dtype=np.float64)
+    signal_out = np.empty(size, dtype=np.float64)
+    bb_low = np.full(size, np.nan)
+    bb_mid = np.full(size, np.nan)
+    bb_up = np.full(size, np.nan)
+    atr_out = np.full(size, np.nan)
+    if size == 0:
+        return rsi_out, macd_out, signal_out, bb_low, bb_mid, bb_up, atr_out
+
+    fast_alpha = 2.0 / (fast + 1.0)
+    slow_alpha = 2.0 / (slow + 1.0)
+    signal_alpha = 2.0 / (signal + 1.0)
+    ema_fast = close[0]
+    ema_slow = close[0]
+    ema_signal = 0.0
+    total = 0.0
+    total_sq = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    avg_tr = 0.0
+
+    for i in range(size):
+        price = close[i]
+
+        # MACD
+        if i > 0:
+            ema_fast = fast_alpha * price + (1.0 - fast_alpha) * ema_fast
+            ema_slow = slow_alpha * price + (1.0 - slow_alpha) * ema_slow
+        macd_value = ema_fast - ema_slow
+        ema_signal = macd_value if i == 0 else signal_alpha * macd_value + (1.0 - signal_alpha) * ema_signal
+        macd_out[i] = macd_value
+        signal_out[i] = ema_signal
+
+        # Bollinger Bands
+        total += price
+        total_sq += price * price
+        if i >= bb_n:
+            old = close[i - bb_n]
+            total -= old
+            total_sq -= old * old
+        if i >= bb_n - 1:
+            mean = total / bb_n
+            var = total_sq / bb_n - mean * mean
+            std = np.sqrt(var) if var > 0 else 0.0
+            bb_mid[i] = mean
+            bb_low[i] = mean - bb_k * std
+            bb_up[i] = mean + bb_k * std
+
+        if i == 0:
+            continue
+        prev = close[i - 1]
+
+        # RSI (Wilder)
+        change = price - prev
+        up = change if change > 0 else 0.0
+        down = -change if change < 0 else 0.0
+        if i <= rsi_n:
+            avg_gain += up / rsi_n
+            avg_loss += down / rsi_n
+        else:
+            avg_gain = (avg_gain * (rsi_n - 1) + up) / rsi_n
+            avg_loss = (avg_loss * (rsi_n - 1) + down) / rsi_n
+        if i >= rsi_n:
+            rsi_out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # ATR (Wilder)
+        tr = max(high[i] - low[i], abs(high[i] - prev), abs(low[i] - prev))
+        if i <= atr_n:
+            avg_tr += tr / atr_n
+        else:
+            avg_tr = (avg_tr * (atr_n - 1) + tr) / atr_n
+        if i >= atr_n:
+            atr_out[i] = avg_tr
+
+    return rsi_out, macd_out, signal_out, bb_low, bb_mid, bb_up, atr_out
+
+
+def column(frame, name):
+    """Borrow an OHLCV column as a contiguous float64 array (zero-copy when possible)"""
+    return np.ascontiguousarray(frame[name].to_numpy(), dtype=np.float64)
+
+
+INDICATOR_NAMES = (
+    "rsi", "macd", "macd_signal", "macd_histogram", "bb_lower", "bb_middle", "bb_upper", "atr"
+)
+
+
+def compute_indicators(frame) -> Dict[str, float]:
+    """Latest indicator values from a Polars (or pandas) OHLCV frame"""
+    if len(frame) == 0:
+        # No candles yet: same NaN the kernels use for a too-short window
+        return dict.fromkeys(INDICATOR_NAMES, float("nan"))
+
+    close = column(frame, "close")
+    high = column(frame, "high")
+    low = column(frame, "low")
+
+    rsi, macd_line, signal_line, lower, middle, upper, atr_values = fused_indicators(close, high, low)
+
+    return {
+        "rsi": float(rsi[-1]),
+        "macd": float(macd_line[-1]),
+        "macd_signal": float(signal_line[-1]),
+        "macd_histogram": float(macd_line[-1] - signal_line[-1]),
+        "bb_lower": float(lower[-1]),
+        "bb_middle": float(middle[-1]),
+        "bb_upper": float(upper[-1]),
+        "atr": float(atr_values[-1]),
+    }
+
+
+def hourly_candles(ticks: pl.DataFrame) -> pl.DataFrame:
+    """Hourly OHLC candles from a (timestamp, price) tick frame"""
+    return (
+        ticks.sort("timestamp")
+        .group_by_dynamic("timestamp", every="1h")
+        .agg(
+            pl.col("price").first().alias("open"),
+            pl.col("price").max().alias("high"),
+            pl.col("price").min().alias("low"),
+            pl.col("price").last().alias("close"),
+        )
+    )
+
+
+def technical_summary(frame) -> Dict[str, Any]:
+    """Engine technical fields from the latest candle, omitting any without enough history"""
+    if len(frame) == 0:
+        return {}
+
+    values = compute_indicators(frame)
+    price = float(column(frame, "close")[-1])
+    summary = {}
+
+    if not math.isnan(values["rsi"]):
+        summary["rsi"] = values["rsi"]
+
+    histogram = values["macd_histogram"]
+    summary["macd_signal"] = "bullish" if histogram > 0 else "bearish" if histogram < 0 else "neutral"
+
+    lower, upper = values["bb_lower"], values["bb_upper"]
+    if not math.isnan(lower):
+        width = upper - lower
+        summary["bollinger_position"] = (price - lower) / width if width > 0 else 0.5
+
+    return summary
+
+
+def warmup():
+    """Compile all kernels ahead of the first analysis cycle"""
+    sample = np.linspace(1.0, 2.0, 64)
+    rsi_wilder(sample, 14)
+    macd(sample, 12, 26, 9)
+    bbands(sample, 20, 2.0)
+    atr(sample * 1.01, sample * 0.99, sample, 14)
+    fused_indicators(sample, sample * 1.01, sample * 0.99)
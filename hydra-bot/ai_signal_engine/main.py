@@ -4,40 +4,95 @@ Advanced token analysis using OpenAI GPT-4, sentiment analysis, and technical in
 """
 
 import asyncio
-import json
+import hashlib
+import io
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Dict, List, Literal, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
 import openai
 import pandas as pd
 import numpy as np
+import polars as pl
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from loguru import logger
+from prometheus_client import make_asgi_app, Counter
 import httpx
-from sqlalchemy import select
-import ta
-from textblob import TextBlob
+import msgspec
+import orjson
+from sqlalchemy import func, select, text
 
 from config.settings import get_settings
 from core.database import Database
 from core.redis_client import RedisClient
 from models.signal import Signal, SignalType, SignalAction, SignalEngine
+from models.token import Token, TokenPrice
 from services.social_monitor import SocialMonitorService
 from services.technical_analyzer import TechnicalAnalyzer
 from utils.token_analyzer import TokenAnalyzer
+import indicators_numba
+from circuit_breaker import CircuitBreaker, call_with_breaker
+from prompts import build_ai_messages, build_batch_ai_messages
+from sentiment import mean_sentiment
+from serialization import dumps
+from signal_store import SIGNAL_INSERT_SQL, signal_to_payload, signal_to_row
 
 settings = get_settings()
 
+# Redis streams fed by the price and social ingestion services
+MARKET_EVENT_STREAMS = ('price_updates', 'social_updates')
+
+# Seconds between full analysis cycles, and the least idle time before the next one
+FULL_CYCLE_INTERVAL = 60
+MIN_CYCLE_GAP = 5
+
+# Recommendations strong enough to justify a second opinion from the strong model
+ESCALATION_ACTIONS = {'STRONG_BUY', 'BUY', 'SELL', 'STRONG_SELL'}
+
+# Prometheus metrics
+AI_ANALYSES = Counter('ai_signal_engine_analyses_total', 'Token analyses from the cheap model')
+AI_ESCALATIONS = Counter('ai_signal_engine_escalations_total', 'Analyses re-scored by the strong model')
+
+SIGNAL_INSERT = text(SIGNAL_INSERT_SQL)
+
+# Mirrors the SignalAction values the prompt asks for
+Recommendation = Literal[
+    "STRONG_BUY", "BUY", "WEAK_BUY", "HOLD", "WEAK_SELL", "SELL", "STRONG_SELL"
+]
+UnitFloat = Annotated[float, msgspec.Meta(ge=0, le=1)]
+
+class AIAnalysis(msgspec.Struct):
+    """Typed schema of a single model analysis"""
+    recommendation: Recommendation = "HOLD"
+    confidence: UnitFloat = 0.5
+    reasoning: str = "No reasoning provided"
+    target_price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    time_horizon: str = "medium"
+    risk_score: UnitFloat = 0.5
+    key_factors: List[Any] = []
+
+class AIAnalysisBatchItem(AIAnalysis, kw_only=True):
+    """Model analysis for one token of a multi-token request"""
+    mint: str
+
+class AIAnalysisBatch(msgspec.Struct):
+    """Typed schema of a multi-token model response"""
+    analyses: List[AIAnalysisBatchItem] = []
+
+AI_ANALYSIS_DECODER = msgspec.json.Decoder(AIAnalysis)
+AI_BATCH_DECODER = msgspec.json.Decoder(AIAnalysisBatch)
+
 class SignalConfidence(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     VERY_HIGH = "very_high"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TokenAnalysis:
     """Comprehensive token analysis result"""
     token_mint: str
@@ -77,12 +132,28 @@ class AISignalEngine:
     """AI-powered signal generation engine"""
     
     def __init__(self):
-        self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0  # call_with_breaker owns retries
+        )
+        # Batch API calls run outside the breaker, so keep the SDK's own retries there
+        self.openai_batch_client = self.openai_client.with_options(max_retries=2)
+        self.http_client = None
+        self.breakers = {
+            'openai': CircuitBreaker('openai'),
+            'jupiter': CircuitBreaker('jupiter'),
+            'dex': CircuitBreaker('dex')
+        }
         self.database = None
         self.redis_client = None
         self.social_monitor = None
         self.technical_analyzer = None
         self.token_analyzer = None
+        self.pending_batch_mints = set()
+        self.batch_tasks = set()
+        self.known_tokens = {}
+        self.last_analyzed = {}
+        self.last_full_cycle = 0.0
         self.is_running = False
         
     async def initialize(self):
@@ -97,11 +168,21 @@ class AISignalEngine:
         self.redis_client = RedisClient(settings.REDIS_URL)
         await self.redis_client.connect()
         
+        # Shared HTTP/2 client for price lookups
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+            timeout=httpx.Timeout(5.0)
+        )
+        
         # Initialize analyzers
         self.social_monitor = SocialMonitorService()
         self.technical_analyzer = TechnicalAnalyzer()
         self.token_analyzer = TokenAnalyzer()
         
+        # Compile indicator kernels before the first analysis cycle
+        await asyncio.to_thread(indicators_numba.warmup)
+        
         logger.info("✅ AI Signal Engine initialized")
     
     async def start_signal_generation(self):
@@ -112,50 +193,289 @@ class AISignalEngine:
         self.is_running = True
         logger.info("🎯 Starting AI signal generation...")
         
+        # Start reading the event streams from now on
+        stream_ids = {stream: f"{int(time.time() * 1000)}-0" for stream in MARKET_EVENT_STREAMS}
+        tokens = None
+        
         while self.is_running:
             try:
-                # Get tokens to analyze
-                tokens = await self.get_tokens_to_analyze()
-                
-                # Analyze each token
-                for token in tokens:
-                    try:
-                        analysis = await self.analyze_token(token)
-                        signal = await self.generate_signal(analysis)
-                        
-                        if signal:
-                            await self.save_signal(signal)
-                            await self.broadcast_signal(signal)
-                            
-                    except Exception as e:
-                        logger.error(f"Error analyzing token {token.get('symbol', 'Unknown')}: {e}")
+                if tokens is None:
+                    # Full refresh of the analysis universe
+                    self.last_full_cycle = time.monotonic()
+                    self.prune_debounce_state()
+                    tokens = await self.get_tokens_to_analyze()
+                    self.known_tokens = {t['mint']: t for t in tokens}
+                    await self.run_analysis_cycle(tokens, allow_batch=True)
+                else:
+                    # Tokens with fresh market events react immediately
+                    await self.run_analysis_cycle(tokens, allow_batch=False)
                 
-                # Wait before next analysis cycle
-                await asyncio.sleep(60)  # Analyze every minute
+                tokens = await self.wait_for_market_events(stream_ids)
                 
             except Exception as e:
                 logger.error(f"Error in signal generation loop: {e}")
+                tokens = None
                 await asyncio.sleep(30)
     
+    async def wait_for_market_events(self, stream_ids: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """Block until market events arrive; None means a full analysis cycle is due"""
+        # Full cycle at least every minute, even while events keep arriving
+        remaining = FULL_CYCLE_INTERVAL - (time.monotonic() - self.last_full_cycle)
+        if remaining <= 0:
+            # A cycle overran the interval; idle briefly instead of running back-to-back
+            await asyncio.sleep(MIN_CYCLE_GAP)
+            return None
+        
+        if not await self.redis_client.exists(*MARKET_EVENT_STREAMS):
+            # Ingestion services haven't created the streams yet
+            await asyncio.sleep(max(remaining, MIN_CYCLE_GAP))
+            return None
+        
+        entries = await self.redis_client.xread(stream_ids, block=int(remaining * 1000))
+        if not entries:
+            return None
+        
+        now = time.monotonic()
+        tokens = {}
+        
+        for stream, messages in entries:
+            for message_id, fields in messages:
+                stream_ids[stream] = message_id
+                
+                mint = fields.get('mint')
+                if not mint or mint in tokens:
+                    continue
+                
+                # Debounce: analyze a mint at most once per window
+                if now - self.last_analyzed.get(mint, 0) < settings.EVENT_DEBOUNCE_SECONDS:
+                    continue
+                
+                tokens[mint] = self.known_tokens.get(mint) or {
+                    'mint': mint,
+                    'symbol': fields.get('symbol', mint[:6]),
+                    'name': fields.get('name')
+                }
+        
+        return list(tokens.values())
+    
+    def prune_debounce_state(self):
+        """Forget debounce timestamps that can no longer suppress an event"""
+        cutoff = time.monotonic() - settings.EVENT_DEBOUNCE_SECONDS
+        self.last_analyzed = {
+            mint: ts for mint, ts in self.last_analyzed.items() if ts > cutoff
+        }
+    
+    async def run_analysis_cycle(self, tokens: List[Dict[str, Any]], allow_batch: bool = True):
+        """Analyze tokens, then persist and broadcast the resulting signals"""
+        if not tokens:
+            return
+        
+        # One timestamp for every signal produced this cycle
+        cycle_ts = datetime.now(timezone.utc)
+        cycle_iso = cycle_ts.isoformat()
+        
+        now = time.monotonic()
+        for token in tokens:
+            self.last_analyzed[token['mint']] = now
+        
+        # Warm the price cache for the whole cycle in a few requests
+        await self.get_price_data_bulk([t['mint'] for t in tokens])
+        
+        # Analyze concurrently, bounded to avoid API rate limits
+        sem = asyncio.Semaphore(settings.SIGNAL_CONCURRENCY)
+        tasks = []
+        
+        # Long-tail tokens go through the cheaper Batch API
+        if allow_batch and settings.OPENAI_BATCH_ENABLED:
+            batch_tokens = [
+                t for t in tokens
+                if (t.get('volume_24h') or 0) < settings.REALTIME_VOLUME_THRESHOLD
+            ]
+            tokens = [t for t in tokens if t not in batch_tokens]
+            tasks.append(asyncio.create_task(self.submit_batch_analysis(batch_tokens, sem)))
+        
+        # Group tokens so each AI request covers several of them
+        size = settings.AI_PROMPT_BATCH_SIZE
+        groups = [tokens[i:i + size] for i in range(0, len(tokens), size)]
+        tasks.extend(
+            asyncio.create_task(self._bounded_analyze(sem, group))
+            for group in groups
+        )
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        signals = [
+            signal
+            for result in results if isinstance(result, list)
+            for signal in result
+        ]
+        
+        # Persist the whole cycle at once, then fan out
+        await self.save_signals_bulk(signals, cycle_ts)
+        await self.broadcast_signals(signals, cycle_iso)
+    
+    async def _bounded_analyze(
+        self,
+        sem: asyncio.Semaphore,
+        tokens: List[Dict[str, Any]]
+    ) -> List[Signal]:
+        """Analyze a group of tokens and generate their signals, holding a semaphore slot"""
+        signals = []
+        
+        async with sem:
+            try:
+                analyses = await self.analyze_tokens(tokens)
+            except Exception as e:
+                symbols = ', '.join(t.get('symbol', 'Unknown') for t in tokens)
+                logger.error(f"Error analyzing tokens {symbols}: {e}")
+                return signals
+            
+            for analysis in analyses:
+                try:
+                    signal = await self.generate_signal(analysis)
+                    
+                    if signal:
+                        signals.append(signal)
+                        
+                except Exception as e:
+                    logger.error(f"Error generating signal for {analysis.symbol}: {e}")
+        
+        return signals
+    
     async def analyze_token(self, token: Dict[str, Any]) -> TokenAnalysis:
         """Perform comprehensive token analysis"""
         logger.info(f"🔍 Analyzing token: {token['symbol']}")
         
-        # Get price and market data
-        price_data = await self.get_price_data(token['mint'])
+        price_data, technical_data, social_data = await self.collect_token_data(token)
+        
+        # AI-powered analysis
+        ai_analysis = await self.get_ai_analysis(token, price_data, technical_data, social_data)
+        
+        return self.build_token_analysis(token, price_data, technical_data, social_data, ai_analysis)
+    
+    async def analyze_tokens(self, tokens: List[Dict[str, Any]]) -> List[TokenAnalysis]:
+        """Analyze several tokens with a single AI request"""
+        logger.info(f"🔍 Analyzing tokens: {', '.join(t['symbol'] for t in tokens)}")
+        
+        collected = await asyncio.gather(
+            *(self.collect_token_data(token) for token in tokens),
+            return_exceptions=True
+        )
+        
+        tokens_ctx = []
+        for token, data in zip(tokens, collected):
+            if isinstance(data, Exception):
+                logger.error(f"Error collecting data for {token.get('symbol', 'Unknown')}: {data}")
+                continue
+            
+            price_data, technical_data, social_data = data
+            tokens_ctx.append({
+                'token': token,
+                'price_data': price_data,
+                'technical_data': technical_data,
+                'social_data': social_data
+            })
+        
+        if not tokens_ctx:
+            return []
+        
+        if len(tokens_ctx) == 1:
+            ctx = tokens_ctx[0]
+            ai_analyses = {ctx['token']['mint']: await self.get_ai_analysis(**ctx)}
+        else:
+            ai_analyses = await self.get_ai_analysis_batch(tokens_ctx)
+        
+        # Build each analysis separately so one bad value only drops its own token
+        analyses = []
+        for ctx in tokens_ctx:
+            try:
+                analyses.append(self.build_token_analysis(
+                    ctx['token'],
+                    ctx['price_data'],
+                    ctx['technical_data'],
+                    ctx['social_data'],
+                    ai_analyses[ctx['token']['mint']]
+                ))
+            except Exception as e:
+                logger.error(f"Error building analysis for {ctx['token'].get('symbol', 'Unknown')}: {e}")
+        
+        return analyses
+    
+    async def collect_token_data(self, token: Dict[str, Any]):
+        """Gather price, technical and social data for a token concurrently"""
+        price_data, technical_data, social_data = await asyncio.gather(
+            self.get_price_data(token['mint']),
+            self.get_technical_data(token['mint']),
+            self.social_monitor.get_sentiment(token['symbol'])
+        )
+        
+        # Score the raw posts behind the sentiment with one vectorized lexicon pass
+        texts = social_data.get('texts')
+        if texts:
+            social_data['sentiment_score'] = await asyncio.to_thread(mean_sentiment, texts)
+        
+        return price_data, technical_data, social_data
+    
+    async def get_technical_data(self, token_mint: str) -> Dict[str, Any]:
+        """Get 1h technical indicators, cached until the current candle closes"""
+        cache_key = f"technical:{token_mint}:{int(time.time() // 3600)}"
+        cached_data = await self.redis_client.get(cache_key)
+        
+        if cached_data:
+            return orjson.loads(cached_data)
         
-        # Technical analysis
         technical_data = await self.technical_analyzer.analyze(
-            token['mint'], 
+            token_mint, 
             timeframe='1h'
         )
         
-        # Social sentiment analysis
-        social_data = await self.social_monitor.get_sentiment(token['symbol'])
+        # RSI, MACD and Bollinger position from the Numba kernels over stored prices
+        try:
+            candles = await self.get_price_candles(token_mint)
+            technical_data.update(indicators_numba.technical_summary(candles))
+        except Exception as e:
+            logger.warning(f"Indicator kernels unavailable for {token_mint}: {e}")
         
-        # AI-powered analysis
-        ai_analysis = await self.get_ai_analysis(token, price_data, technical_data, social_data)
+        await self.redis_client.setex(
+            cache_key, 3600,
+            dumps(technical_data)
+        )
+        
+        return technical_data
+    
+    async def get_price_candles(self, token_mint: str) -> pl.DataFrame:
+        """Hourly candles built from the last three days of stored prices"""
+        async with self.database.get_session() as session:
+            stmt = (
+                select(TokenPrice.timestamp, TokenPrice.price)
+                .join(Token, Token.id == TokenPrice.token_id)
+                .where(
+                    Token.mint == token_mint,
+                    TokenPrice.timestamp > func.now() - text("INTERVAL '72 hours'")
+                )
+                .order_by(TokenPrice.timestamp)
+            )
+            
+            result = await session.execute(stmt)
+            rows = result.all()
         
+        ticks = pl.DataFrame(
+            {
+                'timestamp': [row.timestamp for row in rows],
+                'price': [float(row.price) for row in rows]
+            },
+            schema={'timestamp': pl.Datetime, 'price': pl.Float64}
+        )
+        
+        return indicators_numba.hourly_candles(ticks)
+    
+    def build_token_analysis(
+        self,
+        token: Dict[str, Any],
+        price_data: Dict[str, Any],
+        technical_data: Dict[str, Any],
+        social_data: Dict[str, Any],
+        ai_analysis: Dict[str, Any]
+    ) -> TokenAnalysis:
+        """Combine market data and AI output into a TokenAnalysis"""
         return TokenAnalysis(
             token_mint=token['mint'],
             symbol=token['symbol'],
@@ -191,6 +511,10 @@ class AISignalEngine:
             smart_money_activity=social_data['smart_money_activity']
         )
     
+    def parse_ai_analysis(self, content: str) -> Dict[str, Any]:
+        """Decode and validate the model's JSON response into an analysis dict"""
+        return msgspec.structs.asdict(AI_ANALYSIS_DECODER.decode(content))
+    
     async def get_ai_analysis(
         self, 
         token: Dict[str, Any], 
@@ -198,93 +522,302 @@ class AISignalEngine:
         technical_data: Dict[str, Any], 
         social_data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Get AI-powered analysis using OpenAI GPT-4"""
+        """Get AI-powered analysis, escalating to the strong model when warranted"""
         
-        # Prepare context for AI analysis
-        context = f"""
-        Analyze the following Solana token for trading opportunities:
-
-        TOKEN INFORMATION:
-        - Symbol: {token['symbol']}
-        - Name: {token.get('name', 'Unknown')}
-        - Current Price: ${price_data['price']:.8f}
-        - Market Cap: ${price_data.get('market_cap', 0):,.2f}
-        - 24h Volume: ${price_data.get('volume_24h', 0):,.2f}
-        - 24h Change: {price_data.get('change_24h', 0):.2f}%
-
-        TECHNICAL INDICATORS:
-        - RSI: {technical_data['rsi']:.2f}
-        - MACD Signal: {technical_data['macd_signal']}
-        - Bollinger Position: {technical_data['bollinger_position']:.2f}
-        - Volume Profile: {technical_data['volume_profile']}
-        - Support: ${technical_data['support_resistance']['support']:.8f}
-        - Resistance: ${technical_data['support_resistance']['resistance']:.8f}
-        - Liquidity Risk: {technical_data['liquidity_risk']:.2f}
-        - Volatility Risk: {technical_data['volatility_risk']:.2f}
-
-        SOCIAL SENTIMENT:
-        - Overall Sentiment: {social_data['sentiment_score']:.2f}
-        - News Sentiment: {social_data['news_sentiment']:.2f}
-        - Community Activity: {social_data['activity_score']}
-        - Influencer Mentions: {social_data['influencer_mentions']}
-        - Smart Money Activity: {social_data['smart_money_activity']:.2f}
-
-        Please provide a detailed trading analysis including:
-        1. Recommendation (STRONG_BUY, BUY, WEAK_BUY, HOLD, WEAK_SELL, SELL, STRONG_SELL)
-        2. Confidence level (0.0 to 1.0)
-        3. Detailed reasoning
-        4. Target price (if bullish)
-        5. Stop loss level
-        6. Time horizon (short, medium, long)
-        7. Risk score (0.0 to 1.0)
-        8. Key factors driving the recommendation
-
-        Respond in JSON format.
-        """
+        messages = build_ai_messages(token, price_data, technical_data, social_data)
+        cache_key = self.ai_cache_key(token, price_data, technical_data, social_data)
         
         try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4-1106-preview",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert cryptocurrency trader and analyst with deep knowledge of Solana DeFi. Provide precise, actionable trading recommendations based on technical analysis, sentiment data, and market conditions. Focus on risk management and realistic price targets."
-                    },
-                    {
-                        "role": "user",
-                        "content": context
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
+            # Skip the model call when the inputs haven't changed
+            cached_analysis = await self.redis_client.get(cache_key)
+            if cached_analysis:
+                return orjson.loads(cached_analysis)
             
-            analysis = json.loads(response.choices[0].message.content)
+            # Cheap model first, strong model only for promising candidates
+            analysis = await self.request_ai_analysis(messages, settings.CHEAP_MODEL)
+            AI_ANALYSES.inc()
             
-            return {
-                'recommendation': analysis.get('recommendation', 'HOLD'),
-                'confidence': float(analysis.get('confidence', 0.5)),
-                'reasoning': analysis.get('reasoning', 'No reasoning provided'),
-                'target_price': analysis.get('target_price'),
-                'stop_loss': analysis.get('stop_loss'),
-                'time_horizon': analysis.get('time_horizon', 'medium'),
-                'risk_score': float(analysis.get('risk_score', 0.5)),
-                'key_factors': analysis.get('key_factors', [])
-            }
+            if self.needs_escalation(analysis):
+                AI_ESCALATIONS.inc()
+                try:
+                    analysis = await self.request_ai_analysis(messages, settings.STRONG_MODEL)
+                except Exception as e:
+                    logger.error(f"Error escalating AI analysis for {token['symbol']}: {e}")
+            
+            await self.redis_client.setex(
+                cache_key, settings.AI_ANALYSIS_CACHE_TTL, orjson.dumps(analysis)
+            )
+            
+            return analysis
             
         except Exception as e:
             logger.error(f"Error getting AI analysis: {e}")
-            return {
-                'recommendation': 'HOLD',
-                'confidence': 0.0,
-                'reasoning': f'AI analysis failed: {str(e)}',
-                'target_price': None,
-                'stop_loss': None,
-                'time_horizon': 'unknown',
-                'risk_score': 1.0,
-                'key_factors': []
-            }
+            return self.fallback_ai_analysis(str(e))
+    
+    async def get_ai_analysis_batch(self, tokens_ctx: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Get AI analyses for several tokens in a single request, keyed by mint"""
+        cache_keys = {ctx['token']['mint']: self.ai_cache_key(**ctx) for ctx in tokens_ctx}
+        analyses = {}
+        
+        try:
+            # Reuse analyses whose inputs haven't changed
+            cached = await self.redis_client.mget(list(cache_keys.values()))
+            for mint, cached_analysis in zip(cache_keys, cached):
+                if cached_analysis:
+                    analyses[mint] = orjson.loads(cached_analysis)
+        except Exception as e:
+            logger.error(f"Error reading cached AI analyses: {e}")
+        
+        pending = [ctx for ctx in tokens_ctx if ctx['token']['mint'] not in analyses]
+        if not pending:
+            return analyses
+        
+        mints = [ctx['token']['mint'] for ctx in pending]
+        
+        try:
+            # Cheap model first, strong model only for promising candidates
+            fresh = await self.request_ai_analysis_batch(pending, settings.CHEAP_MODEL)
+            AI_ANALYSES.inc(len(fresh))
+            
+            escalate = [
+                ctx for ctx in pending
+                if ctx['token']['mint'] in fresh
+                and self.needs_escalation(fresh[ctx['token']['mint']])
+            ]
+            if escalate:
+                AI_ESCALATIONS.inc(len(escalate))
+                try:
+                    fresh.update(await self.request_ai_analysis_batch(escalate, settings.STRONG_MODEL))
+                except Exception as e:
+                    logger.error(f"Error escalating batched AI analysis: {e}")
+            
+            for mint, analysis in fresh.items():
+                await self.redis_client.setex(
+                    cache_keys[mint], settings.AI_ANALYSIS_CACHE_TTL, orjson.dumps(analysis)
+                )
+            analyses.update(fresh)
+            
+        except Exception as e:
+            logger.error(f"Error getting batched AI analysis: {e}")
+            for mint in mints:
+                analyses.setdefault(mint, self.fallback_ai_analysis(str(e)))
+            return analyses
+        
+        for mint in mints:
+            if mint not in analyses:
+                analyses[mint] = self.fallback_ai_analysis('Token missing from AI response')
+        
+        return analyses
+    
+    async def request_ai_analysis(self, messages: List[Dict[str, str]], model: str) -> Dict[str, Any]:
+        """Run a single-token analysis request against the given model"""
+        response = await call_with_breaker(
+            self.breakers['openai'],
+            self.openai_client.chat.completions.create,
+            model=model,
+            messages=messages,
+            temperature=settings.OPENAI_TEMPERATURE,
+            max_tokens=settings.OPENAI_MAX_TOKENS,
+            response_format={"type": "json_object"}
+        )
+        
+        return self.parse_ai_analysis(response.choices[0].message.content)
+    
+    async def request_ai_analysis_batch(
+        self,
+        tokens_ctx: List[Dict[str, Any]],
+        model: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run a multi-token analysis request against the given model, keyed by mint"""
+        mints = {ctx['token']['mint'] for ctx in tokens_ctx}
+        
+        response = await call_with_breaker(
+            self.breakers['openai'],
+            self.openai_client.chat.completions.create,
+            model=model,
+            messages=build_batch_ai_messages(tokens_ctx),
+            temperature=settings.OPENAI_TEMPERATURE,
+            max_tokens=settings.OPENAI_MAX_TOKENS * len(tokens_ctx),
+            response_format={"type": "json_object"}
+        )
+        
+        content = AI_BATCH_DECODER.decode(response.choices[0].message.content)
+        analyses = {}
+        for item in content.analyses:
+            if item.mint in mints:
+                analysis = msgspec.structs.asdict(item)
+                del analysis['mint']
+                analyses[item.mint] = analysis
+        
+        return analyses
+    
+    def needs_escalation(self, analysis: Dict[str, Any]) -> bool:
+        """Whether a cheap-model analysis should be re-scored by the strong model"""
+        return (
+            analysis['confidence'] >= settings.ESCALATION_CONFIDENCE
+            and analysis['recommendation'] in ESCALATION_ACTIONS
+        )
+    
+    def ai_cache_key(
+        self,
+        token: Dict[str, Any],
+        price_data: Dict[str, Any],
+        technical_data: Dict[str, Any],
+        social_data: Dict[str, Any]
+    ) -> str:
+        """Cache key for an AI analysis, derived from all of its inputs"""
+        content_hash = hashlib.sha1(dumps({
+            'token': token,
+            'price_data': price_data,
+            'technical_data': technical_data,
+            'social_data': social_data
+        }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        
+        return f"ai_analysis:{token['mint']}:{content_hash}"
+    
+    def fallback_ai_analysis(self, reason: str) -> Dict[str, Any]:
+        """Neutral HOLD analysis used when the model call fails"""
+        return {
+            'recommendation': 'HOLD',
+            'confidence': 0.0,
+            'reasoning': f'AI analysis failed: {reason}',
+            'target_price': None,
+            'stop_loss': None,
+            'time_horizon': 'unknown',
+            'risk_score': 1.0,
+            'key_factors': []
+        }
+    
+    async def submit_batch_analysis(
+        self,
+        tokens: List[Dict[str, Any]],
+        sem: asyncio.Semaphore
+    ) -> Optional[str]:
+        """Submit non-urgent token analyses through the OpenAI Batch API"""
+        tokens = [t for t in tokens if t['mint'] not in self.pending_batch_mints]
+        if not tokens:
+            return None
+        
+        async def bounded_collect(token: Dict[str, Any]):
+            async with sem:
+                return await self.collect_token_data(token)
+        
+        # Signals are stamped with the time their inputs were captured, not when the batch completes
+        captured_ts = datetime.now(timezone.utc)
+        collected = await asyncio.gather(
+            *(bounded_collect(token) for token in tokens),
+            return_exceptions=True
+        )
+        
+        contexts = {}
+        buffer = io.BytesIO()
+        
+        for token, data in zip(tokens, collected):
+            if isinstance(data, Exception):
+                logger.error(f"Error collecting batch data for {token.get('symbol', 'Unknown')}: {data}")
+                continue
+            
+            price_data, technical_data, social_data = data
+            contexts[token['mint']] = (token, price_data, technical_data, social_data)
+            buffer.write(orjson.dumps({
+                "custom_id": token['mint'],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": settings.CHEAP_MODEL,
+                    "messages": build_ai_messages(token, price_data, technical_data, social_data),
+                    "temperature": settings.OPENAI_TEMPERATURE,
+                    "max_tokens": settings.OPENAI_MAX_TOKENS,
+                    "response_format": {"type": "json_object"}
+                }
+            }))
+            buffer.write(b"\n")
+        
+        if not contexts:
+            return None
+        
+        try:
+            batch_file = await self.openai_batch_client.files.create(
+                file=("signal_batch.jsonl", buffer.getvalue()),
+                purpose="batch"
+            )
+            batch = await self.openai_batch_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            logger.error(f"Error submitting analysis batch: {e}")
+            return None
+        
+        self.pending_batch_mints.update(contexts)
+        task = asyncio.create_task(self.collect_batch_results(batch.id, contexts, captured_ts))
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
+        
+        logger.info(f"📦 Submitted analysis batch {batch.id} with {len(contexts)} tokens")
+        return batch.id
+    
+    async def collect_batch_results(
+        self,
+        batch_id: str,
+        contexts: Dict[str, tuple],
+        captured_ts: datetime
+    ):
+        """Poll a submitted batch and turn its results into signals"""
+        try:
+            while self.is_running:
+                batch = await self.openai_batch_client.batches.retrieve(batch_id)
+                
+                if batch.status == "completed":
+                    break
+                if batch.status in ("failed", "expired", "cancelled"):
+                    logger.warning(f"Analysis batch {batch_id} ended with status {batch.status}")
+                    return
+                
+                await asyncio.sleep(settings.OPENAI_BATCH_POLL_INTERVAL)
+            else:
+                return
+            
+            if not batch.output_file_id:
+                logger.warning(f"Analysis batch {batch_id} completed without output")
+                return
+            
+            content = await self.openai_batch_client.files.content(batch.output_file_id)
+            signals = []
+            
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                
+                try:
+                    result = orjson.loads(line)
+                    mint = result['custom_id']
+                    if mint not in contexts or result.get('error'):
+                        continue
+                    
+                    body = result['response']['body']
+                    ai_analysis = self.parse_ai_analysis(body['choices'][0]['message']['content'])
+                    
+                    token, price_data, technical_data, social_data = contexts[mint]
+                    analysis = self.build_token_analysis(
+                        token, price_data, technical_data, social_data, ai_analysis
+                    )
+                    signal = await self.generate_signal(analysis)
+                    
+                    if signal:
+                        signals.append(signal)
+                        
+                except Exception as e:
+                    logger.error(f"Error processing batch result in {batch_id}: {e}")
+            
+            await self.save_signals_bulk(signals, captured_ts)
+            await self.broadcast_signals(signals, captured_ts.isoformat())
+                    
+        except Exception as e:
+            logger.error(f"Error collecting analysis batch {batch_id}: {e}")
+        finally:
+            self.pending_batch_mints.difference_update(contexts)
     
     async def generate_signal(self, analysis: TokenAnalysis) -> Optional[Signal]:
         """Generate trading signal from analysis"""
@@ -352,34 +885,62 @@ class AISignalEngine:
         try:
             # Get tokens from database
             async with self.database.get_session() as session:
+                # Latest price row per token, so each token appears once
+                latest = (
+                    select(
+                        TokenPrice.token_id,
+                        TokenPrice.volume_24h,
+                        TokenPrice.market_cap
+                    )
+                    .where(TokenPrice.timestamp > func.now() - text("INTERVAL '1 hour'"))
+                    .distinct(TokenPrice.token_id)
+                    .order_by(TokenPrice.token_id, TokenPrice.timestamp.desc())
+                    .subquery()
+                )
+                
                 # Get top tokens by volume and market cap
-                query = """
-                SELECT DISTINCT t.mint, t.symbol, t.name, tp.volume_24h, tp.market_cap
-                FROM tokens t
-                JOIN token_prices tp ON t.id = tp.token_id
-                WHERE tp.timestamp > NOW() - INTERVAL '1 hour'
-                  AND t.is_scam = false
-                  AND tp.volume_24h > 10000
-                ORDER BY tp.volume_24h DESC
-                LIMIT 50
-                """
+                stmt = (
+                    select(
+                        Token.mint,
+                        Token.symbol,
+                        Token.name,
+                        latest.c.volume_24h,
+                        latest.c.market_cap
+                    )
+                    .join(latest, Token.id == latest.c.token_id)
+                    .where(
+                        Token.is_scam.is_(False),
+                        latest.c.volume_24h > 10000
+                    )
+                    .order_by(latest.c.volume_24h.desc())
+                    .limit(50)
+                )
                 
-                result = await session.execute(query)
-                tokens = [dict(row) for row in result.fetchall()]
+                result = await session.execute(stmt)
+                tokens = [dict(row) for row in result.mappings()]
                 
             # Also include trending tokens from social media
             trending_tokens = await self.social_monitor.get_trending_tokens()
             
-            # Combine and deduplicate
-            all_tokens = tokens + trending_tokens
-            unique_tokens = {token['mint']: token for token in all_tokens}
+            # Combine and deduplicate, keeping the first entry per mint
+            unique_tokens = {}
+            for token in tokens + trending_tokens:
+                unique_tokens.setdefault(token['mint'], token)
+                if len(unique_tokens) == 25:  # Analyze top 25
+                    break
             
-            return list(unique_tokens.values())[:25]  # Analyze top 25
+            return list(unique_tokens.values())
             
         except Exception as e:
             logger.error(f"Error getting tokens to analyze: {e}")
             return []
     
+    async def http_get(self, url: str, **kwargs) -> httpx.Response:
+        """GET that raises on error statuses so the breaker sees 5xx outages"""
+        response = await self.http_client.get(url, **kwargs)
+        response.raise_for_status()
+        return response
+    
     async def get_price_data(self, token_mint: str) -> Dict[str, Any]:
         """Get current price and market data for token"""
         try:
@@ -388,50 +949,54 @@ class AISignalEngine:
             cached_data = await self.redis_client.get(cache_key)
             
             if cached_data:
-                return json.loads(cached_data)
+                return orjson.loads(cached_data)
             
-            # Fetch from Jupiter/DexScreener
-            async with httpx.AsyncClient() as client:
-                # Try Jupiter first
-                response = await client.get(
-                    f"https://price.jup.ag/v4/price?ids={token_mint}"
-                )
+            # Fetch from Jupiter/DexScreener over the shared connection pool
+            # Try Jupiter first
+            response = await call_with_breaker(
+                self.breakers['jupiter'],
+                self.http_get,
+                f"https://price.jup.ag/v4/price?ids={token_mint}"
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                price_info = data.get('data', {}).get(token_mint, {})
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    price_info = data.get('data', {}).get(token_mint, {})
-                    
-                    price_data = {
-                        'price': float(price_info.get('price', 0)),
-                        'market_cap': None,  # Jupiter doesn't provide this
-                        'volume_24h': None,
-                        'change_24h': None
-                    }
-                    
-                    # Try to get additional data from DexScreener
-                    try:
-                        dex_response = await client.get(
-                            f"https://api.dexscreener.com/latest/dex/tokens/{token_mint}"
-                        )
-                        
-                        if dex_response.status_code == 200:
-                            dex_data = dex_response.json()
-                            if dex_data.get('pairs'):
-                                pair = dex_data['pairs'][0]  # Get first pair
-                                price_data.update({
-                                    'market_cap': float(pair.get('fdv', 0)),
-                                    'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
-                                    'change_24h': float(pair.get('priceChange', {}).get('h24', 0))
-                                })
-                    except:
-                        pass  # DexScreener data is optional
-                    
-                    # Cache for 30 seconds
-                    await self.redis_client.setex(
-                        cache_key, 30, json.dumps(price_data)
+                price_data = {
+                    'price': float(price_info.get('price', 0)),
+                    'market_cap': None,  # Jupiter doesn't provide this
+                    'volume_24h': None,
+                    'change_24h': None
+                }
+                
+                # Try to get additional data from DexScreener
+                try:
+                    dex_response = await call_with_breaker(
+                        self.breakers['dex'],
+                        self.http_get,
+                        f"https://api.dexscreener.com/latest/dex/tokens/{token_mint}"
                     )
                     
-                    return price_data
+                    if dex_response.status_code == 200:
+                        dex_data = dex_response.json()
+                        if dex_data.get('pairs'):
+                            pair = dex_data['pairs'][0]  # Get first pair
+                            price_data.update({
+                                'market_cap': float(pair.get('fdv', 0)),
+                                'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
+                                'change_24h': float(pair.get('priceChange', {}).get('h24', 0))
+                            })
+                except:
+                    pass  # DexScreener data is optional
+                
+                # Cache for 30 seconds
+                await self.redis_client.setex(
+                    cache_key, 30,
+                    dumps(price_data)
+                )
+                
+                return price_data
             
             # Fallback values
             return {
@@ -450,67 +1015,118 @@ class AISignalEngine:
                 'change_24h': 0
             }
     
-    async def save_signal(self, signal: Signal):
-        """Save signal to database"""
+    async def get_price_data_bulk(self, token_mints: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch price data for many tokens at once and populate the price cache"""
+        if not token_mints:
+            return {}
+        
         try:
-            async with self.database.get_session() as session:
-                # Convert signal to database record
-                signal_record = {
-                    'token_mint': signal.token_mint,
-                    'engine': signal.engine.value,
-                    'type': signal.type.value,
-                    'action': signal.action.value,
-                    'confidence': signal.confidence,
-                    'price': signal.price,
-                    'target_price': signal.target_price,
-                    'stop_loss': signal.stop_loss,
-                    'timeframe': signal.timeframe,
-                    'reasoning': signal.reasoning,
-                    'metadata': signal.metadata,
-                    'status': 'ACTIVE',
-                    'created_at': datetime.utcnow()
+            # Jupiter accepts all mints in a single request
+            response = await call_with_breaker(
+                self.breakers['jupiter'],
+                self.http_get,
+                "https://price.jup.ag/v4/price",
+                params={'ids': ','.join(token_mints)}
+            )
+            prices = response.json().get('data', {})
+            price_map = {
+                mint: {
+                    'price': float(prices[mint].get('price', 0)),
+                    'market_cap': None,  # Jupiter doesn't provide this
+                    'volume_24h': None,
+                    'change_24h': None
                 }
-                
+                for mint in token_mints if mint in prices
+            }
+            
+            # DexScreener accepts up to 30 addresses per request
+            mints = list(price_map)
+            for i in range(0, len(mints), 30):
+                try:
+                    dex_response = await call_with_breaker(
+                        self.breakers['dex'],
+                        self.http_get,
+                        f"https://api.dexscreener.com/latest/dex/tokens/{','.join(mints[i:i + 30])}"
+                    )
+                    seen = set()
+                    for pair in dex_response.json().get('pairs') or []:
+                        mint = pair.get('baseToken', {}).get('address')
+                        if mint not in price_map or mint in seen:
+                            continue
+                        seen.add(mint)  # Use the first pair per token
+                        price_map[mint].update({
+                            'market_cap': float(pair.get('fdv', 0)),
+                            'volume_24h': float(pair.get('volume', {}).get('h24', 0)),
+                            'change_24h': float(pair.get('priceChange', {}).get('h24', 0))
+                        })
+                except Exception:
+                    pass  # DexScreener data is optional
+            
+            # Cache for 30 seconds, in one round trip
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for mint, price_data in price_map.items():
+                    pipe.setex(
+                        f"price_data:{mint}", 30,
+                        dumps(price_data)
+                    )
+                await pipe.execute()
+            
+            return price_map
+            
+        except Exception as e:
+            logger.error(f"Error getting bulk price data: {e}")
+            return {}
+    
+    async def save_signals_bulk(self, signals: List[Signal], created_at: datetime):
+        """Save a batch of signals to the database in a single transaction"""
+        if not signals:
+            return
+        
+        try:
+            # signals."createdAt" is timestamp(3) without time zone, in UTC
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            
+            async with self.database.get_session() as session:
+                # One executemany round trip and one commit for the whole batch
                 await session.execute(
-                    "INSERT INTO signals (...) VALUES (...)",
-                    signal_record
+                    SIGNAL_INSERT,
+                    [signal_to_row(signal, created_at) for signal in signals]
                 )
                 await session.commit()
                 
-            logger.info(f"💾 Saved signal for {signal.token_mint}")
+            logger.info(f"💾 Saved {len(signals)} signals")
             
         except Exception as e:
-            logger.error(f"Error saving signal: {e}")
+            logger.error(f"Error saving signals: {e}")
     
-    async def broadcast_signal(self, signal: Signal):
-        """Broadcast signal to Redis for real-time distribution"""
+    async def broadcast_signals(self, signals: List[Signal], timestamp: str):
+        """Broadcast signals to Redis for real-time distribution in one round trip"""
+        if not signals:
+            return
+        
         try:
-            signal_data = {
-                'token_mint': signal.token_mint,
-                'type': signal.type.value,
-                'action': signal.action.value,
-                'confidence': signal.confidence,
-                'price': signal.price,
-                'target_price': signal.target_price,
-                'stop_loss': signal.stop_loss,
-                'reasoning': signal.reasoning,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            payloads = [signal_to_payload(signal, timestamp) for signal in signals]
             
             # Publish to Redis channel
-            await self.redis_client.publish(
-                'trading_signals',
-                json.dumps(signal_data)
-            )
+            async with self.redis_client.pipeline() as pipe:
+                for payload in payloads:
+                    pipe.publish('trading_signals', payload)
+                await pipe.execute()
             
-            logger.info(f"📡 Broadcasted signal for {signal.token_mint}")
+            logger.info(f"📡 Broadcasted {len(signals)} signals")
             
         except Exception as e:
-            logger.error(f"Error broadcasting signal: {e}")
+            logger.error(f"Error broadcasting signals: {e}")
     
     async def stop(self):
         """Stop the signal generation engine"""
         self.is_running = False
+        for task in self.batch_tasks:
+            task.cancel()
+        if self.batch_tasks:
+            await asyncio.gather(*self.batch_tasks, return_exceptions=True)
+        if self.http_client:
+            await self.http_client.aclose()
         logger.info("🛑 AI Signal Engine stopped")
 
 # FastAPI app for AI Signal Engine
@@ -518,6 +1134,9 @@ app = FastAPI(title="Hydra Bot AI Signal Engine", version="1.0.0")
 
 engine = AISignalEngine()
 
+# Add Prometheus metrics endpoint
+app.mount("/metrics", make_asgi_app())
+
 @app.on_event("startup")
 async def startup():
     await engine.initialize()
@@ -539,9 +1158,12 @@ async def root():
 async def health():
     return {
         "status": "healthy" if engine.is_running else "unhealthy",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    import uvloop
+    
+    uvloop.install()
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Hydra Bot AI Prompts
+Compact chat messages for single- and multi-token analysis requests
+"""
+
+import numbers
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import numpy as np
+
+from serialization import dumps
+
+AI_SYSTEM_PROMPT = (
+    "You are an expert cryptocurrency trader and analyst with deep knowledge of Solana DeFi. "
+    "Provide precise, actionable trading recommendations based on technical analysis, sentiment data, "
+    "and market conditions. Focus on risk management and realistic price targets.\n"
+    "Reply with a JSON object with keys: "
+    "recommendation (STRONG_BUY|BUY|WEAK_BUY|HOLD|WEAK_SELL|SELL|STRONG_SELL), "
+    "confidence (0-1), reasoning, target_price (if bullish), stop_loss, "
+    "time_horizon (short|medium|long), risk_score (0-1), key_factors (list)."
+)
+
+
+def compact_value(value: Any) -> Any:
+    """Round non-integer numbers (incl. numpy scalars) to 4 significant digits to keep prompts short"""
+    if isinstance(value, numbers.Integral):  # ints and bools pass through unchanged
+        return value
+    if isinstance(value, (numbers.Real, np.floating, Decimal)):
+        return float(f"{float(value):.4g}")
+    return value
+
+
+def build_ai_messages(
+    token: Dict[str, Any],
+    price_data: Dict[str, Any],
+    technical_data: Dict[str, Any],
+    social_data: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a token analysis request"""
+    fields = build_token_context(token, price_data, technical_data, social_data)
+    fields.pop('mint', None)
+
+    context = "Analyze this Solana token:\n" + "\n".join(
+        f"{key}: {value}" for key, value in fields.items()
+    )
+
+    return [
+        {"role": "system", "content": AI_SYSTEM_PROMPT},
+        {"role": "user", "content": context}
+    ]
+
+
+def build_token_context(
+    token: Dict[str, Any],
+    price_data: Dict[str, Any],
+    technical_data: Dict[str, Any],
+    social_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Flatten a token's market data into a compact dict, dropping empty fields"""
+    context = {
+        'mint': token['mint'],
+        'symbol': token['symbol'],
+        'name': token.get('name'),
+        'price': price_data['price'],
+        'market_cap': price_data.get('market_cap'),
+        'volume_24h': price_data.get('volume_24h'),
+        'change_24h_pct': price_data.get('change_24h'),
+        'rsi': technical_data['rsi'],
+        'macd_signal': technical_data['macd_signal'],
+        'bollinger_position': technical_data['bollinger_position'],
+        'volume_profile': technical_data['volume_profile'],
+        'support': technical_data['support_resistance']['support'],
+        'resistance': technical_data['support_resistance']['resistance'],
+        'liquidity_risk': technical_data['liquidity_risk'],
+        'volatility_risk': technical_data['volatility_risk'],
+        'sentiment': social_data['sentiment_score'],
+        'news_sentiment': social_data['news_sentiment'],
+        'community_activity': social_data['activity_score'],
+        'influencer_mentions': social_data['influencer_mentions'],
+        'smart_money_activity': social_data['smart_money_activity']
+    }
+
+    return {
+        key: compact_value(value)
+        for key, value in context.items()
+        if value is not None and value != 0 and value != ''
+    }
+
+
+def build_batch_ai_messages(tokens_ctx: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Build one chat request covering several tokens"""
+    tokens_payload = dumps({
+        'tokens': [build_token_context(**ctx) for ctx in tokens_ctx]
+    }).decode('utf-8')
+
+    context = (
+        "Analyze each Solana token below. Wrap the per-token objects as "
+        '{"analyses": [...]}, one per token, each including its mint.\n'
+        + tokens_payload
+    )
+
+    return [
+        {"role": "system", "content": AI_SYSTEM_PROMPT},
+        {"role": "user", "content": context}
+    ]
@@ -0,0 +1,80 @@
+"""
+Hydra Bot Sentiment Scoring
+Vectorized VADER-lexicon polarity for batches of social posts
+"""
+
+import string
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Share of non-ASCII characters above which an unscored text is worth a TextBlob pass
+NON_ASCII_FALLBACK_RATIO = 0.3
+
+
+class LexiconSentiment:
+    """Scores many texts at once with a single sparse matrix product"""
+
+    def __init__(self, lexicon: Dict[str, float]):
+        self.vocab = {word: i for i, word in enumerate(lexicon)}
+        # VADER valences range from -4 to 4; scale to TextBlob's -1..1 polarity
+        self.valences = np.fromiter(lexicon.values(), dtype=np.float64, count=len(lexicon)) / 4.0
+
+    def score(self, texts: List[str]) -> np.ndarray:
+        """Return one polarity score in [-1, 1] per text"""
+        if not texts:
+            return np.zeros(0)
+
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                idx = self.vocab.get(word)
+                if idx is None:
+                    idx = self.vocab.get(word.strip(string.punctuation))
+                if idx is not None:
+                    rows.append(row)
+                    cols.append(idx)
+
+        counts = csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(texts), len(self.vocab))
+        )
+        totals = counts @ self.valences
+        hits = np.asarray(counts.sum(axis=1)).ravel()
+        scores = np.divide(totals, hits, out=np.zeros(len(texts)), where=hits > 0)
+
+        # Zero hits on plain ASCII text is neutral English; only retry heavily non-ASCII text
+        for i in np.flatnonzero(hits == 0):
+            if non_ascii_ratio(texts[i]) >= NON_ASCII_FALLBACK_RATIO:
+                scores[i] = TextBlob(texts[i]).sentiment.polarity
+
+        return np.clip(scores, -1.0, 1.0)
+
+
+def non_ascii_ratio(text: str) -> float:
+    """Fraction of characters outside ASCII"""
+    if not text:
+        return 0.0
+    return sum(not ch.isascii() for ch in text) / len(text)
+
+
+@lru_cache(maxsize=1)
+def get_lexicon_sentiment() -> LexiconSentiment:
+    """Get the shared scorer, loading the VADER lexicon once"""
+    return LexiconSentiment(SentimentIntensityAnalyzer().lexicon)
+
+
+def score_texts(texts: List[str]) -> np.ndarray:
+    """Score a batch of texts with the shared lexicon scorer"""
+    return get_lexicon_sentiment().score(texts)
+
+
+def mean_sentiment(texts: List[str]) -> float:
+    """Average polarity of a batch of texts, neutral when there are none"""
+    if not texts:
+        return 0.0
+    return float(score_texts(texts).mean())
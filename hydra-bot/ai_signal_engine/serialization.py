@@ -0,0 +1,20 @@
+"""
+Hydra Bot JSON Serialization
+orjson helpers shared by the engine's caches, prompts and broadcasts
+"""
+
+from decimal import Decimal
+
+import orjson
+
+
+def json_default(value):
+    """orjson fallback: Decimals stay numbers so cache hits match fresh values"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps(value, option: int = 0) -> bytes:
+    """Serialize to JSON, including NumPy scalars and arrays"""
+    return orjson.dumps(value, default=json_default, option=option | orjson.OPT_SERIALIZE_NUMPY)
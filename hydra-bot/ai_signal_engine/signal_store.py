@@ -0,0 +1,97 @@
+"""
+Hydra Bot Signal Storage
+Rows for the signals table and the payloads broadcast to other services
+"""
+
+import secrets
+import string
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from serialization import dumps
+
+# Columns written per signal, named as in backend/prisma/schema.prisma (model Signal)
+SIGNAL_COLUMNS = (
+    "id", "tokenId", "engine", "type", "action", "confidence", "price", "targetPrice",
+    "stopLoss", "timeframe", "reasoning", "metadata", "status", "createdAt"
+)
+
+# Explicit casts keep the parameter types independent of the driver; tokenId is looked
+# up by mint, so signals for tokens missing from the tokens table are skipped
+SIGNAL_INSERT_SQL = """
+    INSERT INTO signals (
+        id, "tokenId", engine, type, action, confidence, price, "targetPrice",
+        "stopLoss", timeframe, reasoning, metadata, status, "createdAt"
+    )
+    SELECT
+        CAST(:id AS TEXT),
+        tokens.id,
+        CAST(:engine AS "SignalEngine"),
+        CAST(:type AS "SignalType"),
+        CAST(:action AS "SignalAction"),
+        CAST(:confidence AS NUMERIC),
+        CAST(:price AS NUMERIC),
+        CAST(:target_price AS NUMERIC),
+        CAST(:stop_loss AS NUMERIC),
+        CAST(:timeframe AS TEXT),
+        CAST(:reasoning AS JSONB),
+        CAST(:metadata AS JSONB),
+        CAST('ACTIVE' AS "SignalStatus"),
+        CAST(:created_at AS TIMESTAMP(3))
+    FROM tokens
+    WHERE tokens.mint = :token_mint
+"""
+
+ID_ALPHABET = string.digits + string.ascii_lowercase
+
+
+def new_signal_id() -> str:
+    """Primary key in Prisma's cuid shape: 'c', a base36 millisecond timestamp, then random base36"""
+    millis = int(time.time() * 1000)
+    stamp = ""
+    while millis:
+        millis, digit = divmod(millis, 36)
+        stamp = ID_ALPHABET[digit] + stamp
+    suffix = "".join(secrets.choice(ID_ALPHABET) for _ in range(16))
+    return f"c{stamp[-8:]:0>8}{suffix}"
+
+
+def to_decimal(value: Any) -> Optional[Decimal]:
+    """Numeric column value; str() keeps floats at their shortest repr"""
+    return None if value is None else Decimal(str(value))
+
+
+def signal_to_row(signal, created_at: datetime) -> Dict[str, Any]:
+    """Bind parameters for SIGNAL_INSERT_SQL"""
+    return {
+        'id': new_signal_id(),
+        'token_mint': signal.token_mint,
+        'engine': signal.engine.value,
+        'type': signal.type.value,
+        'action': signal.action.value,
+        'confidence': to_decimal(signal.confidence),
+        'price': to_decimal(signal.price),
+        'target_price': to_decimal(signal.target_price),
+        'stop_loss': to_decimal(signal.stop_loss),
+        'timeframe': signal.timeframe,
+        'reasoning': dumps(signal.reasoning).decode('utf-8'),
+        'metadata': dumps(signal.metadata).decode('utf-8'),
+        'created_at': created_at
+    }
+
+
+def signal_to_payload(signal, timestamp: str) -> bytes:
+    """JSON message published on the trading_signals channel"""
+    return dumps({
+        'token_mint': signal.token_mint,
+        'type': signal.type.value,
+        'action': signal.action.value,
+        'confidence': signal.confidence,
+        'price': signal.price,
+        'target_price': signal.target_price,
+        'stop_loss': signal.stop_loss,
+        'reasoning': signal.reasoning,
+        'timestamp': timestamp
+    })
@@ -88,6 +88,13 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = Field(default="gpt-4-1106-preview", env="OPENAI_MODEL")
     OPENAI_TEMPERATURE: float = Field(default=0.3, env="OPENAI_TEMPERATURE")
     OPENAI_MAX_TOKENS: int = Field(default=1000, env="OPENAI_MAX_TOKENS")
+    CHEAP_MODEL: str = Field(default="gpt-4o-mini", env="CHEAP_MODEL")
+    STRONG_MODEL: str = Field(default="gpt-4o", env="STRONG_MODEL")
+    ESCALATION_CONFIDENCE: float = Field(default=0.7, env="ESCALATION_CONFIDENCE")
+    # Opt-in: delays every token under REALTIME_VOLUME_THRESHOLD by up to the batch window
+    OPENAI_BATCH_ENABLED: bool = Field(default=False, env="OPENAI_BATCH_ENABLED")
+    OPENAI_BATCH_POLL_INTERVAL: int = Field(default=300, env="OPENAI_BATCH_POLL_INTERVAL")  # seconds
+    AI_ANALYSIS_CACHE_TTL: int = Field(default=300, env="AI_ANALYSIS_CACHE_TTL")  # seconds
     
     # =================================
     # Social Media APIs
@@ -145,6 +152,10 @@ class Settings(BaseSettings):
     MIN_SIGNAL_CONFIDENCE: Decimal = Field(default=Decimal("0.7"), env="MIN_SIGNAL_CONFIDENCE")
     SENTIMENT_WEIGHT: Decimal = Field(default=Decimal("0.3"), env="SENTIMENT_WEIGHT")
     TECHNICAL_WEIGHT: Decimal = Field(default=Decimal("0.7"), env="TECHNICAL_WEIGHT")
+    SIGNAL_CONCURRENCY: int = Field(default=10, env="SIGNAL_CONCURRENCY")  # parallel token analyses
+    AI_PROMPT_BATCH_SIZE: int = Field(default=8, env="AI_PROMPT_BATCH_SIZE")  # tokens per AI request
+    EVENT_DEBOUNCE_SECONDS: int = Field(default=15, env="EVENT_DEBOUNCE_SECONDS")  # per-mint re-analysis window
+    REALTIME_VOLUME_THRESHOLD: float = Field(default=1_000_000, env="REALTIME_VOLUME_THRESHOLD")  # USD, below goes to batch
     
     # =================================
     # Treasury Management
@@ -336,7 +347,8 @@ class Settings(BaseSettings):
                 "enabled": self.AI_SIGNALS_ENABLED,
                 "min_confidence": float(self.MIN_SIGNAL_CONFIDENCE),
                 "sentiment_weight": float(self.SENTIMENT_WEIGHT),
-                "technical_weight": float(self.TECHNICAL_WEIGHT)
+                "technical_weight": float(self.TECHNICAL_WEIGHT),
+                "concurrency": self.SIGNAL_CONCURRENCY
             },
             "guardian": {
                 "enabled": self.GUARDIAN_ENABLED
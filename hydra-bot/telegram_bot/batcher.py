@@ -0,0 +1,66 @@
+"""
+Hydra Bot Async Batcher
+Coalesces items arriving close together into a single batch
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Generic, List, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class AsyncBatcher(ABC, Generic[T]):
+    """Collects items for up to max_queue_time seconds (or max_batch_size items) and processes them together"""
+
+    def __init__(self, max_batch_size: int = 50, max_queue_time: float = 0.2):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self.pending: List[T] = []
+        self.flush_timer: Optional[asyncio.Task] = None
+        self.batch_tasks = set()
+
+    async def process(self, item: T):
+        """Queue an item; the batch is flushed in the background"""
+        self.pending.append(item)
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.flush_timer is None:
+            self.flush_timer = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.max_queue_time)
+        self.flush_timer = None
+        self.flush()
+
+    def flush(self):
+        """Hand the queued items to process_batch"""
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+        task = asyncio.create_task(self.run_batch(batch))
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
+
+    async def run_batch(self, batch: List[T]):
+        try:
+            await self.process_batch(batch)
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(batch)} items: {e}")
+
+    @abstractmethod
+    async def process_batch(self, items: List[T]):
+        """Handle one flushed batch"""
+
+    async def close(self):
+        """Flush anything still queued and wait for in-flight batches"""
+        self.flush()
+        if self.batch_tasks:
+            await asyncio.gather(*self.batch_tasks, return_exceptions=True)
@@ -4,11 +4,13 @@ Complete Telegram bot with trading commands and real-time notifications
 """
 
 import asyncio
-import json
+import html
 import logging
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 
 import telegram
@@ -17,13 +19,16 @@ from telegram import (
     KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
 )
 from telegram.ext import (
-    Application, CommandHandler, CallbackQueryHandler, 
+    AIORateLimiter, Application, CommandHandler, CallbackQueryHandler, 
     MessageHandler, filters, ContextTypes
 )
 from telegram.constants import ParseMode
+from telegram.error import RetryAfter
 import httpx
+import orjson
 from loguru import logger
 
+from batcher import AsyncBatcher
 from config.settings import get_settings
 from core.database import Database
 from core.redis_client import RedisClient
@@ -36,6 +41,271 @@ from utils.keyboards import create_main_menu, create_trading_menu, create_portfo
 
 settings = get_settings()
 
+# Seconds a Telegram ID -> user lookup stays cached
+USER_CACHE_TTL = 300
+
+# Seconds the signal subscriber list stays cached
+SUBSCRIBERS_CACHE_KEY = "signal_subscribers:v1"
+SUBSCRIBERS_CACHE_TTL = 60
+
+# Telegram IDs that muted signal alerts from a notification
+MUTED_SIGNAL_USERS_KEY = "muted_signal_users"
+
+# Seconds portfolio summaries and positions stay cached
+PORTFOLIO_CACHE_TTL = 30
+
+# Only portfolios this slow to load, or this large, are worth caching
+PORTFOLIO_CACHE_MIN_MS = 25
+PORTFOLIO_CACHE_MIN_POSITIONS = 5
+
+# Pub/sub events waiting for delivery, and the workers draining them
+NOTIFICATION_QUEUE_SIZE = 10_000
+NOTIFICATION_WORKERS = 8
+
+# Log one warning per this many dropped notifications
+DROP_LOG_EVERY = 100
+
+# Times a send is retried after Telegram answers with RetryAfter
+SEND_MAX_RETRIES = 1
+
+def json_default(value):
+    """orjson fallback for values from the database layer"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+def dumps_cached(value) -> bytes:
+    """Serialize a value for a Redis cache entry"""
+    return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+# Escape dynamic text for HTML parse mode; symbols and names repeat often
+esc = lru_cache(maxsize=1024)(html.escape)
+
+# Message templates, built once at import and filled per call
+FEATURE_UNAVAILABLE_TEXT = "🚧 This feature isn't available yet."
+
+WELCOME_TEMPLATE = """🔥 <b>Welcome to Hydra Bot!</b> 🔥
+
+Hey {first_name}! Ready to dominate Solana trading with the most advanced AI-powered bot?
+
+🚀 <b>What Hydra Bot offers:</b>
+• ⚡ Lightning-fast execution (2-3 seconds)
+• 🤖 AI-powered signal generation
+• 🛡️ Advanced risk management
+• 💎 Real-time portfolio tracking
+• 📊 Professional analytics
+
+<b>Get started by connecting your Solana wallet!</b>""".format
+
+WELCOME_BACK_TEMPLATE = """🔥 <b>Welcome back, {first_name}!</b> 🔥
+
+📊 <b>Your Portfolio:</b>
+💰 Total Value: <b>{portfolio_value}</b>
+📈 Today's P&amp;L: <b>{daily_pnl}</b>
+
+🤖 <b>Hydra Bot Status:</b> ✅ Active
+🎯 <b>Trading Signals:</b> ✅ Enabled
+🛡️ <b>Risk Guard:</b> ✅ Protected
+
+Ready to make some profits? 🚀""".format
+
+BALANCE_TEMPLATE = """💰 <b>Portfolio Balance</b>
+
+📊 <b>Overview:</b>
+💎 Total Value: <b>{total_value}</b>
+📈 Total P&amp;L: <b>{total_pnl}</b> ({total_pnl_percent})
+📅 Today: <b>{daily_pnl}</b>
+📆 This Week: <b>{weekly_pnl}</b>
+📊 This Month: <b>{monthly_pnl}</b>
+
+🔥 <b>Active Positions:</b> {position_count}""".format
+
+WITHDRAW_TEXT = """🔐 <b>Secure Withdrawal</b>
+
+⚠️ <b>Security Notice:</b>
+Withdrawals require identity verification for your protection.
+
+📋 <b>Withdrawal Options:</b>
+• 💰 Withdraw SOL
+• 🪙 Withdraw specific tokens
+• 📊 Withdraw profits only
+• 🔄 Convert &amp; withdraw
+
+🛡️ <b>Security Features:</b>
+• 2FA verification
+• Withdrawal limits
+• Transaction history
+• Real-time monitoring
+
+<b>Click 'Verify Identity' to proceed securely.</b>"""
+
+CONNECT_WALLET_TEXT = """🔗 <b>Connect Your Solana Wallet</b>
+
+<b>Step 1:</b> Visit our secure connection portal:
+🌐 https://hydra-bot.boomroach.com/connect
+
+<b>Step 2:</b> Connect your wallet (Phantom, Solflare, etc.)
+
+<b>Step 3:</b> Sign the verification message
+
+<b>Step 4:</b> Return here and click "✅ Verify Connection"
+
+🛡️ <b>Security:</b> We never store your private keys. The connection is secured with cryptographic signatures."""
+
+SIGNAL_TEMPLATE = """🎯 <b>NEW TRADING SIGNAL</b>
+
+🪙 <b>Token:</b> {token_symbol}
+📊 <b>Action:</b> {action}
+💰 <b>Price:</b> {price}
+🎯 <b>Target:</b> {target_price}
+🛡️ <b>Stop Loss:</b> {stop_loss}
+⭐ <b>Confidence:</b> {confidence:.1%}
+
+🤖 <b>AI Analysis:</b> {reasoning}...""".format
+
+# Static inline keyboards, shared across requests
+CONNECT_PROMPT_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔗 Connect Wallet", callback_data="connect_wallet")],
+    [InlineKeyboardButton("ℹ️ Learn More", callback_data="learn_more")]
+])
+
+BALANCE_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📊 Detailed Portfolio", callback_data="portfolio_detailed"),
+        InlineKeyboardButton("💹 Trading", callback_data="open_trading")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="refresh_balance"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+TRADE_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🚀 Quick Buy", callback_data="quick_buy"),
+        InlineKeyboardButton("📉 Quick Sell", callback_data="quick_sell")
+    ],
+    [
+        InlineKeyboardButton("🎯 View All Signals", callback_data="view_all_signals"),
+        InlineKeyboardButton("⚙️ Trading Settings", callback_data="trading_settings")
+    ],
+    [
+        InlineKeyboardButton("📊 Market Analysis", callback_data="market_analysis"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+ALERTS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("➕ Create Alert", callback_data="create_alert"),
+        InlineKeyboardButton("⚙️ Alert Settings", callback_data="alert_settings")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="refresh_alerts"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+WITHDRAW_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Verify Identity", callback_data="verify_withdrawal"),
+        InlineKeyboardButton("❌ Cancel", callback_data="main_menu")
+    ]
+])
+
+CONNECT_WALLET_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("✅ Verify Connection", callback_data="verify_connection")],
+    [InlineKeyboardButton("❓ Need Help?", callback_data="connection_help")],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+])
+
+# Trailing rows appended to dynamically built keyboards
+QUICK_BUY_FOOTER_ROWS = [
+    [InlineKeyboardButton("🔍 Search Token", callback_data="search_token")],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+]
+
+DISABLE_SIGNAL_ALERTS_ROW = [InlineKeyboardButton("🔕 Disable Alerts", callback_data="disable_signal_alerts")]
+
+ENABLE_SIGNAL_ALERTS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔔 Enable Alerts", callback_data="enable_signal_alerts")]
+])
+
+# Fields every trading_signals payload needs before it can be rendered
+REQUIRED_SIGNAL_FIELDS = ('token_mint', 'action', 'price', 'confidence')
+
+def is_valid_signal(signal) -> bool:
+    """Whether a pub/sub signal payload can be rendered"""
+    return (
+        isinstance(signal, dict)
+        and all(signal.get(field) is not None for field in REQUIRED_SIGNAL_FIELDS)
+        and isinstance(signal['price'], (int, float))
+        and isinstance(signal['confidence'], (int, float))
+    )
+
+# Command -> handler method name
+COMMAND_HANDLERS = (
+    ("start", "start_command"),
+    ("help", "help_command"),
+    ("balance", "balance_command"),
+    ("portfolio", "portfolio_command"),
+    ("trade", "trade_command"),
+    ("alerts", "alerts_command"),
+    ("signals", "signals_command"),
+    ("withdraw", "withdraw_command"),
+    ("settings", "settings_command"),
+    ("stats", "stats_command"),
+    ("leaderboard", "leaderboard_command"),
+)
+
+# Callback data -> handler method name
+CALLBACK_HANDLERS = {
+    "connect_wallet": "handle_connect_wallet",
+    "main_menu": "handle_main_menu",
+    "portfolio_detailed": "handle_detailed_portfolio",
+    "open_trading": "handle_open_trading",
+    "quick_buy": "handle_quick_buy",
+    "quick_sell": "handle_quick_sell",
+    "view_all_signals": "handle_view_signals",
+    "market_analysis": "handle_market_analysis",
+    "disable_signal_alerts": "handle_disable_signal_alerts",
+    "enable_signal_alerts": "handle_enable_signal_alerts",
+}
+
+# Parameterized callbacks carry an ID after their prefix
+CALLBACK_PREFIX_HANDLERS = (
+    ("execute_signal_", "handle_execute_signal"),
+    ("token_details_", "handle_token_details"),
+)
+
+def reasoning_text(reasoning) -> str:
+    """The model's explanation from a signal; the engine sends a dict of factors"""
+    if isinstance(reasoning, dict):
+        reasoning = reasoning.get('ai_reasoning')
+    return reasoning if isinstance(reasoning, str) else ''
+
+class SignalBatcher(AsyncBatcher[Dict[str, Any]]):
+    """Coalesces bursts of trading signals into a single broadcast"""
+    
+    def __init__(self, bot: "HydraTelegramBot"):
+        super().__init__(max_batch_size=50, max_queue_time=0.2)
+        self.bot = bot
+    
+    async def process_batch(self, signals: List[Dict[str, Any]]):
+        # Keep only the latest signal per token, skipping malformed payloads
+        latest = {}
+        for signal in signals:
+            if not is_valid_signal(signal):
+                logger.warning("Skipping malformed trading signal: {}", signal)
+                continue
+            
+            # Engine payloads identify the token by mint only
+            mint = signal['token_mint']
+            latest[mint] = {'token_symbol': mint[:6], 'id': mint, **signal}
+        
+        if latest:
+            await self.bot.broadcast_signal_notification(list(latest.values()))
+
 class HydraTelegramBot:
     """Main Telegram bot class"""
     
@@ -47,6 +317,15 @@ class HydraTelegramBot:
         self.trading_service = None
         self.portfolio_service = None
         self.alert_service = None
+        self.http = None
+        self.signal_batcher = SignalBatcher(self)
+        self.notification_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self.notification_workers = []
+        self.dropped_notifications = 0
+        self.stop_event = asyncio.Event()
+        self.callback_handlers = {}
+        self.callback_prefix_handlers = ()
+        self.callback_prefixes = ()
         self.is_running = False
         
     async def initialize(self):
@@ -61,17 +340,31 @@ class HydraTelegramBot:
         self.redis_client = RedisClient(settings.REDIS_URL)
         await self.redis_client.connect()
         
+        # Shared HTTP client so backend/trading API calls reuse pooled connections
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            http2=True
+        )
+        
         # Initialize services
         self.user_service = UserService(self.database)
         self.trading_service = TradingBotService(
             backend_url=settings.BACKEND_API_URL,
-            trading_url=settings.TRADING_API_URL
+            trading_url=settings.TRADING_API_URL,
+            http=self.http
         )
         self.portfolio_service = PortfolioService(self.database)
         self.alert_service = AlertService(self.redis_client)
         
         # Create Telegram application
-        self.application = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).build()
+        # One shared limiter paces every send to Telegram's flood limits and honours RetryAfter
+        self.application = (
+            Application.builder()
+            .token(settings.TELEGRAM_BOT_TOKEN)
+            .rate_limiter(AIORateLimiter(max_retries=SEND_MAX_RETRIES))
+            .build()
+        )
         
         # Register handlers
         await self.register_handlers()
@@ -82,94 +375,175 @@ class HydraTelegramBot:
         """Register all command and callback handlers"""
         app = self.application
         
-        # Command handlers
-        app.add_handler(CommandHandler("start", self.start_command))
-        app.add_handler(CommandHandler("help", self.help_command))
-        app.add_handler(CommandHandler("balance", self.balance_command))
-        app.add_handler(CommandHandler("portfolio", self.portfolio_command))
-        app.add_handler(CommandHandler("trade", self.trade_command))
-        app.add_handler(CommandHandler("alerts", self.alerts_command))
-        app.add_handler(CommandHandler("signals", self.signals_command))
-        app.add_handler(CommandHandler("withdraw", self.withdraw_command))
-        app.add_handler(CommandHandler("settings", self.settings_command))
-        app.add_handler(CommandHandler("stats", self.stats_command))
-        app.add_handler(CommandHandler("leaderboard", self.leaderboard_command))
+        # Command handlers; commands this build doesn't implement answer "not available"
+        for command, name in COMMAND_HANDLERS:
+            app.add_handler(CommandHandler(command, self.resolve_handler(name, self.command_unavailable)))
         
         # Callback query handlers
         app.add_handler(CallbackQueryHandler(self.handle_callback_query))
         
+        self.callback_handlers = {
+            data: self.resolve_handler(name, self.callback_unavailable)
+            for data, name in CALLBACK_HANDLERS.items()
+        }
+        self.callback_prefix_handlers = tuple(
+            (prefix, self.resolve_handler(name, self.callback_unavailable))
+            for prefix, name in CALLBACK_PREFIX_HANDLERS
+        )
+        self.callback_prefixes = tuple(prefix for prefix, _ in self.callback_prefix_handlers)
+        
         # Message handlers
-        app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
+        handle_message = self.resolve_handler("handle_message", None)
+        if handle_message:
+            app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
         
         # Error handler
         app.add_error_handler(self.error_handler)
         
+    def resolve_handler(self, name: str, fallback):
+        """Bound handler method by name, or fallback when it isn't implemented"""
+        handler = getattr(self, name, None)
+        if handler is None:
+            logger.warning("Handler {} is not implemented", name)
+            return fallback
+        return handler
+    
+    async def command_unavailable(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Reply for commands without a handler"""
+        await update.effective_message.reply_text(FEATURE_UNAVAILABLE_TEXT)
+    
+    async def callback_unavailable(self, query, context, *args):
+        """Reply for buttons without a handler"""
+        await query.edit_message_text(FEATURE_UNAVAILABLE_TEXT)
+    
+    async def get_user_by_telegram_id_cached(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a user by Telegram ID through a short-lived Redis cache"""
+        cache_key = f"tg_user:{telegram_id}"
+        
+        try:
+            cached_user = await self.redis_client.get(cache_key)
+            if cached_user:
+                return orjson.loads(cached_user)
+        except Exception as e:
+            logger.error(f"Error reading cached user {telegram_id}: {e}")
+        
+        user_data = await self.user_service.get_user_by_telegram_id(telegram_id)
+        
+        # Only cache known users so a freshly connected wallet is seen immediately
+        if not user_data:
+            return user_data
+        
+        # Return the decoded payload so hits and misses see the same types
+        payload = dumps_cached(user_data)
+        try:
+            await self.redis_client.setex(cache_key, USER_CACHE_TTL, payload)
+        except Exception as e:
+            logger.error(f"Error caching user {telegram_id}: {e}")
+        
+        return orjson.loads(payload)
+    
+    async def get_signal_subscribers_cached(self) -> List[Dict[str, Any]]:
+        """Users with signal notifications enabled, cached briefly in Redis"""
+        try:
+            cached_users = await self.redis_client.get(SUBSCRIBERS_CACHE_KEY)
+            if cached_users:
+                return orjson.loads(cached_users)
+        except Exception as e:
+            logger.error(f"Error reading cached signal subscribers: {e}")
+        
+        users = await self.user_service.get_users_with_signal_notifications()
+        
+        try:
+            await self.redis_client.setex(
+                SUBSCRIBERS_CACHE_KEY, SUBSCRIBERS_CACHE_TTL, dumps_cached(users)
+            )
+        except Exception as e:
+            logger.error(f"Error caching signal subscribers: {e}")
+        
+        return users
+    
+    async def get_portfolio_snapshot(self, user_id) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Portfolio summary and active positions, read from Redis in one round-trip"""
+        portfolio_key = f"portfolio:{user_id}"
+        positions_key = f"positions:{user_id}"
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(portfolio_key)
+                pipe.get(positions_key)
+                cached_portfolio, cached_positions = await pipe.execute()
+            
+            if cached_portfolio and cached_positions:
+                return orjson.loads(cached_portfolio), orjson.loads(cached_positions)
+        except Exception as e:
+            logger.error(f"Error reading cached portfolio for user {user_id}: {e}")
+        
+        started = time.perf_counter()
+        portfolio, positions = await asyncio.gather(
+            self.portfolio_service.get_portfolio_summary(user_id),
+            self.portfolio_service.get_active_positions(user_id)
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        # Round-trip through JSON so misses return the same types as cache hits
+        portfolio_json = dumps_cached(portfolio)
+        positions_json = dumps_cached(positions)
+        snapshot = orjson.loads(portfolio_json), orjson.loads(positions_json)
+        
+        # Cheap, small portfolios would only crowd useful keys out of Redis
+        if elapsed_ms < PORTFOLIO_CACHE_MIN_MS and len(positions) < PORTFOLIO_CACHE_MIN_POSITIONS:
+            return snapshot
+        
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(portfolio_key, PORTFOLIO_CACHE_TTL, portfolio_json)
+                pipe.setex(positions_key, PORTFOLIO_CACHE_TTL, positions_json)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error caching portfolio for user {user_id}: {e}")
+        
+        return snapshot
+    
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
         chat_id = update.effective_chat.id
         
         # Check if user exists
-        user_data = await self.user_service.get_user_by_telegram_id(user.id)
+        user_data = await self.get_user_by_telegram_id_cached(user.id)
         
         if not user_data:
             # New user - show wallet connection
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("🔗 Connect Wallet", callback_data="connect_wallet")],
-                [InlineKeyboardButton("ℹ️ Learn More", callback_data="learn_more")]
-            ])
-            
-            welcome_text = f"""
-🔥 **Welcome to Hydra Bot!** 🔥
-
-Hey {user.first_name}! Ready to dominate Solana trading with the most advanced AI-powered bot?
-
-🚀 **What Hydra Bot offers:**
-• ⚡ Lightning-fast execution (2-3 seconds)
-• 🤖 AI-powered signal generation
-• 🛡️ Advanced risk management
-• 💎 Real-time portfolio tracking
-• 📊 Professional analytics
-
-**Get started by connecting your Solana wallet!**
-            """
-            
             await update.message.reply_text(
-                welcome_text,
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=keyboard
+                WELCOME_TEMPLATE(first_name=esc(user.first_name)),
+                parse_mode=ParseMode.HTML,
+                reply_markup=CONNECT_PROMPT_KEYBOARD
             )
         else:
             # Existing user - show main menu
             keyboard = create_main_menu()
             
-            portfolio_value = await self.portfolio_service.get_portfolio_value(user_data['id'])
-            daily_pnl = await self.portfolio_service.get_daily_pnl(user_data['id'])
+            portfolio_value, daily_pnl = await asyncio.gather(
+                self.portfolio_service.get_portfolio_value(user_data['id']),
+                self.portfolio_service.get_daily_pnl(user_data['id'])
+            )
             
-            welcome_back_text = f"""
-🔥 **Welcome back, {user.first_name}!** 🔥
-
-📊 **Your Portfolio:**
-💰 Total Value: **{format_currency(portfolio_value)}**
-📈 Today's P&L: **{format_currency(daily_pnl, show_sign=True)}**
-
-🤖 **Hydra Bot Status:** ✅ Active
-🎯 **Trading Signals:** ✅ Enabled
-🛡️ **Risk Guard:** ✅ Protected
-
-Ready to make some profits? 🚀
-            """
+            welcome_back_text = WELCOME_BACK_TEMPLATE(
+                first_name=esc(user.first_name),
+                portfolio_value=format_currency(portfolio_value),
+                daily_pnl=format_currency(daily_pnl, show_sign=True)
+            )
             
             await update.message.reply_text(
                 welcome_back_text,
-                parse_mode=ParseMode.MARKDOWN,
+                parse_mode=ParseMode.HTML,
                 reply_markup=keyboard
             )
     
     async def balance_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /balance command"""
         user_id = update.effective_user.id
-        user_data = await self.user_service.get_user_by_telegram_id(user_id)
+        user_data = await self.get_user_by_telegram_id_cached(user_id)
         
         if not user_data:
             await update.message.reply_text("❌ Please connect your wallet first using /start")
@@ -177,43 +551,28 @@ Ready to make some profits? 🚀
         
         try:
             # Get portfolio data
-            portfolio = await self.portfolio_service.get_portfolio_summary(user_data['id'])
-            positions = await self.portfolio_service.get_active_positions(user_data['id'])
+            portfolio, positions = await self.get_portfolio_snapshot(user_data['id'])
             
-            balance_text = f"""
-💰 **Portfolio Balance**
-
-📊 **Overview:**
-💎 Total Value: **{format_currency(portfolio['total_value'])}**
-📈 Total P&L: **{format_currency(portfolio['total_pnl'], show_sign=True)}** ({format_percentage(portfolio['total_pnl_percent'])})
-📅 Today: **{format_currency(portfolio['daily_pnl'], show_sign=True)}**
-📆 This Week: **{format_currency(portfolio['weekly_pnl'], show_sign=True)}**
-📊 This Month: **{format_currency(portfolio['monthly_pnl'], show_sign=True)}**
-
-🔥 **Active Positions:** {len(positions)}
-            """
+            balance_text = BALANCE_TEMPLATE(
+                total_value=format_currency(portfolio['total_value']),
+                total_pnl=format_currency(portfolio['total_pnl'], show_sign=True),
+                total_pnl_percent=format_percentage(portfolio['total_pnl_percent']),
+                daily_pnl=format_currency(portfolio['daily_pnl'], show_sign=True),
+                weekly_pnl=format_currency(portfolio['weekly_pnl'], show_sign=True),
+                monthly_pnl=format_currency(portfolio['monthly_pnl'], show_sign=True),
+                position_count=len(positions)
+            )
             
             if positions:
-                balance_text += "\n\n💎 **Top Positions:**\n"
+                balance_text += "\n\n💎 <b>Top Positions:</b>\n"
                 for pos in positions[:5]:  # Show top 5
                     pnl_emoji = "📈" if pos['unrealized_pnl'] >= 0 else "📉"
-                    balance_text += f"{pnl_emoji} **{pos['token_symbol']}**: {format_currency(pos['value'])} ({format_percentage(pos['unrealized_pnl_pct'])})\n"
-            
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("📊 Detailed Portfolio", callback_data="portfolio_detailed"),
-                    InlineKeyboardButton("💹 Trading", callback_data="open_trading")
-                ],
-                [
-                    InlineKeyboardButton("🔄 Refresh", callback_data="refresh_balance"),
-                    InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-                ]
-            ])
+                    balance_text += f"{pnl_emoji} <b>{esc(pos['token_symbol'])}</b>: {format_currency(pos['value'])} ({format_percentage(pos['unrealized_pnl_pct'])})\n"
             
             await update.message.reply_text(
                 balance_text,
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=keyboard
+                parse_mode=ParseMode.HTML,
+                reply_markup=BALANCE_KEYBOARD
             )
             
         except Exception as e:
@@ -223,7 +582,7 @@ Ready to make some profits? 🚀
     async def trade_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /trade command"""
         user_id = update.effective_user.id
-        user_data = await self.user_service.get_user_by_telegram_id(user_id)
+        user_data = await self.get_user_by_telegram_id_cached(user_id)
         
         if not user_data:
             await update.message.reply_text("❌ Please connect your wallet first using /start")
@@ -232,45 +591,30 @@ Ready to make some profits? 🚀
         # Get recent signals
         signals = await self.get_recent_signals(limit=5)
         
-        trade_text = "⚡ **Quick Trading Dashboard**\n\n"
+        trade_text = "⚡ <b>Quick Trading Dashboard</b>\n\n"
         
         if signals:
-            trade_text += "🎯 **Latest AI Signals:**\n"
+            trade_text += "🎯 <b>Latest AI Signals:</b>\n"
             for signal in signals:
                 action_emoji = "🚀" if signal['action'] in ['STRONG_BUY', 'BUY'] else "⚠️" if signal['action'] == 'HOLD' else "🔻"
                 confidence_stars = "⭐" * int(signal['confidence'] * 5)
                 
-                trade_text += f"{action_emoji} **{signal['token_symbol']}** - {signal['action']}\n"
+                trade_text += f"{action_emoji} <b>{esc(signal['token_symbol'])}</b> - {esc(signal['action'])}\n"
                 trade_text += f"   💰 Price: {format_price(signal['price'])}\n"
                 trade_text += f"   🎯 Confidence: {confidence_stars} ({signal['confidence']:.1%})\n\n"
         else:
             trade_text += "🔍 No recent signals. Analyzing markets...\n\n"
         
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("🚀 Quick Buy", callback_data="quick_buy"),
-                InlineKeyboardButton("📉 Quick Sell", callback_data="quick_sell")
-            ],
-            [
-                InlineKeyboardButton("🎯 View All Signals", callback_data="view_all_signals"),
-                InlineKeyboardButton("⚙️ Trading Settings", callback_data="trading_settings")
-            ],
-            [
-                InlineKeyboardButton("📊 Market Analysis", callback_data="market_analysis"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ])
-        
         await update.message.reply_text(
             trade_text,
-            parse_mode=ParseMode.MARKDOWN,
-            reply_markup=keyboard
+            parse_mode=ParseMode.HTML,
+            reply_markup=TRADE_KEYBOARD
         )
     
     async def alerts_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /alerts command"""
         user_id = update.effective_user.id
-        user_data = await self.user_service.get_user_by_telegram_id(user_id)
+        user_data = await self.get_user_by_telegram_id_cached(user_id)
         
         if not user_data:
             await update.message.reply_text("❌ Please connect your wallet first using /start")
@@ -279,78 +623,40 @@ Ready to make some profits? 🚀
         # Get user's active alerts
         alerts = await self.alert_service.get_user_alerts(user_data['id'])
         
-        alerts_text = "🔔 **Your Trading Alerts**\n\n"
+        alerts_text = "🔔 <b>Your Trading Alerts</b>\n\n"
         
         if alerts:
             for alert in alerts:
                 status_emoji = "✅" if alert['is_active'] else "⏸️"
-                alerts_text += f"{status_emoji} **{alert['type']}**\n"
-                alerts_text += f"   📍 Token: {alert['token_symbol']}\n"
-                alerts_text += f"   💰 Trigger: {alert['trigger_condition']}\n"
-                alerts_text += f"   📅 Created: {alert['created_at'].strftime('%m/%d %H:%M')}\n\n"
+                alerts_text += f"{status_emoji} <b>{esc(alert['type'])}</b>\n"
+                alerts_text += f"   📍 Token: {esc(alert['token_symbol'])}\n"
+                alerts_text += f"   💰 Trigger: {esc(str(alert['trigger_condition']))}\n"
+                created_at = alert['created_at']
+                alerts_text += f"   📅 Created: {created_at.month:02d}/{created_at.day:02d} {created_at.hour:02d}:{created_at.minute:02d}\n\n"
         else:
             alerts_text += "📭 No active alerts.\n\nSet up alerts to get notified about:\n"
             alerts_text += "• 🎯 Signal triggers\n• 💰 Price movements\n• 🛡️ Risk warnings\n• 📊 Portfolio changes\n\n"
         
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("➕ Create Alert", callback_data="create_alert"),
-                InlineKeyboardButton("⚙️ Alert Settings", callback_data="alert_settings")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="refresh_alerts"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ])
-        
         await update.message.reply_text(
             alerts_text,
-            parse_mode=ParseMode.MARKDOWN,
-            reply_markup=keyboard
+            parse_mode=ParseMode.HTML,
+            reply_markup=ALERTS_KEYBOARD
         )
     
     async def withdraw_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /withdraw command"""
         user_id = update.effective_user.id
-        user_data = await self.user_service.get_user_by_telegram_id(user_id)
+        user_data = await self.get_user_by_telegram_id_cached(user_id)
         
         if not user_data:
             await update.message.reply_text("❌ Please connect your wallet first using /start")
             return
         
         # Security check
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("✅ Verify Identity", callback_data="verify_withdrawal"),
-                InlineKeyboardButton("❌ Cancel", callback_data="main_menu")
-            ]
-        ])
-        
-        withdraw_text = """
-🔐 **Secure Withdrawal**
-
-⚠️ **Security Notice:**
-Withdrawals require identity verification for your protection.
-
-📋 **Withdrawal Options:**
-• 💰 Withdraw SOL
-• 🪙 Withdraw specific tokens
-• 📊 Withdraw profits only
-• 🔄 Convert & withdraw
-
-🛡️ **Security Features:**
-• 2FA verification
-• Withdrawal limits
-• Transaction history
-• Real-time monitoring
-
-**Click 'Verify Identity' to proceed securely.**
-        """
-        
         await update.message.reply_text(
-            withdraw_text,
-            parse_mode=ParseMode.MARKDOWN,
-            reply_markup=keyboard
+            WITHDRAW_TEXT,
+            parse_mode=ParseMode.HTML,
+            reply_markup=WITHDRAW_KEYBOARD
         )
     
     async def handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -362,70 +668,54 @@ Withdrawals require identity verification for your protection.
         user_id = update.effective_user.id
         
         try:
-            if data == "connect_wallet":
-                await self.handle_connect_wallet(query, context)
-            elif data == "main_menu":
-                await self.handle_main_menu(query, context)
-            elif data == "portfolio_detailed":
-                await self.handle_detailed_portfolio(query, context)
-            elif data == "open_trading":
-                await self.handle_open_trading(query, context)
-            elif data == "quick_buy":
-                await self.handle_quick_buy(query, context)
-            elif data == "quick_sell":
-                await self.handle_quick_sell(query, context)
-            elif data == "view_all_signals":
-                await self.handle_view_signals(query, context)
-            elif data == "market_analysis":
-                await self.handle_market_analysis(query, context)
-            elif data.startswith("execute_signal_"):
-                signal_id = data.split("_")[-1]
-                await self.handle_execute_signal(query, context, signal_id)
-            elif data.startswith("token_details_"):
-                token_mint = data.split("_", 2)[-1]
-                await self.handle_token_details(query, context, token_mint)
-            else:
-                await query.edit_message_text("❓ Unknown action. Please try again.")
+            handler = self.callback_handlers.get(data)
+            if handler:
+                await handler(query, context)
+                return
+            
+            # Parameterized callbacks carry an ID after their prefix
+            if data.startswith(self.callback_prefixes):
+                for prefix, prefix_handler in self.callback_prefix_handlers:
+                    if data.startswith(prefix):
+                        await prefix_handler(query, context, data[len(prefix):])
+                        return
+            
+            await query.edit_message_text("❓ Unknown action. Please try again.")
                 
-        except Exception as e:
-            logger.error(f"Error handling callback query {data}: {e}")
+        except Exception:
+            logger.opt(exception=True).error("Error handling callback query {}", data)
             await query.edit_message_text("❌ An error occurred. Please try again.")
     
     async def handle_connect_wallet(self, query, context):
         """Handle wallet connection process"""
-        connect_text = """
-🔗 **Connect Your Solana Wallet**
-
-**Step 1:** Visit our secure connection portal:
-🌐 https://hydra-bot.boomroach.com/connect
-
-**Step 2:** Connect your wallet (Phantom, Solflare, etc.)
-
-**Step 3:** Sign the verification message
-
-**Step 4:** Return here and click "✅ Verify Connection"
-
-🛡️ **Security:** We never store your private keys. The connection is secured with cryptographic signatures.
-        """
-        
-        keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("✅ Verify Connection", callback_data="verify_connection")],
-            [InlineKeyboardButton("❓ Need Help?", callback_data="connection_help")],
-            [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-        ])
-        
         await query.edit_message_text(
-            connect_text,
-            parse_mode=ParseMode.MARKDOWN,
-            reply_markup=keyboard
+            CONNECT_WALLET_TEXT,
+            parse_mode=ParseMode.HTML,
+            reply_markup=CONNECT_WALLET_KEYBOARD
         )
     
+    async def handle_disable_signal_alerts(self, query, context):
+        """Mute signal broadcasts for this user"""
+        await self.redis_client.sadd(MUTED_SIGNAL_USERS_KEY, query.from_user.id)
+        
+        await query.edit_message_reply_markup(reply_markup=None)
+        await query.message.reply_text(
+            "🔕 Signal alerts disabled.",
+            reply_markup=ENABLE_SIGNAL_ALERTS_KEYBOARD
+        )
+    
+    async def handle_enable_signal_alerts(self, query, context):
+        """Resume signal broadcasts for this user"""
+        await self.redis_client.srem(MUTED_SIGNAL_USERS_KEY, query.from_user.id)
+        
+        await query.edit_message_text("🔔 Signal alerts enabled.")
+    
     async def handle_quick_buy(self, query, context):
         """Handle quick buy interface"""
         # Get trending tokens
         trending = await self.get_trending_tokens()
         
-        quick_buy_text = "🚀 **Quick Buy**\n\nSelect a token to buy:\n\n"
+        quick_buy_text = "🚀 <b>Quick Buy</b>\n\nSelect a token to buy:\n\n"
         
         keyboard_buttons = []
         for token in trending[:6]:  # Show top 6 trending
@@ -435,16 +725,13 @@ Withdrawals require identity verification for your protection.
                 InlineKeyboardButton(button_text, callback_data=f"buy_token_{token['mint']}")
             ])
         
-        keyboard_buttons.extend([
-            [InlineKeyboardButton("🔍 Search Token", callback_data="search_token")],
-            [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-        ])
+        keyboard_buttons.extend(QUICK_BUY_FOOTER_ROWS)
         
         keyboard = InlineKeyboardMarkup(keyboard_buttons)
         
         await query.edit_message_text(
             quick_buy_text,
-            parse_mode=ParseMode.MARKDOWN,
+            parse_mode=ParseMode.HTML,
             reply_markup=keyboard
         )
     
@@ -460,54 +747,111 @@ Withdrawals require identity verification for your protection.
         async for message in pubsub.listen():
             try:
                 if message['type'] == 'message':
-                    data = json.loads(message['data'])
-                    
-                    if message['channel'] == 'trading_signals':
-                        await self.broadcast_signal_notification(data)
-                    elif message['channel'] == 'risk_alerts':
-                        await self.broadcast_risk_alert(data)
-                    elif message['channel'] == 'portfolio_updates':
-                        await self.broadcast_portfolio_update(data)
+                    self.enqueue_notification(message['channel'], orjson.loads(message['data']))
                         
-            except Exception as e:
-                logger.error(f"Error processing notification: {e}")
+            except Exception:
+                logger.opt(exception=True).error("Error processing notification")
     
-    async def broadcast_signal_notification(self, signal_data):
-        """Broadcast trading signal to subscribed users"""
-        # Get users who want signal notifications
-        users = await self.user_service.get_users_with_signal_notifications()
+    def enqueue_notification(self, channel, data):
+        """Queue an event for the workers, dropping the oldest one when full"""
+        if self.notification_queue.full():
+            self.notification_queue.get_nowait()
+            self.notification_queue.task_done()
+            self.dropped_notifications += 1
+            if self.dropped_notifications % DROP_LOG_EVERY == 1:
+                logger.warning("⚠️ Notification queue full, dropped {} events so far", self.dropped_notifications)
+        
+        self.notification_queue.put_nowait((channel, data))
+    
+    async def notification_worker(self):
+        """Deliver queued pub/sub events"""
+        while True:
+            channel, data = await self.notification_queue.get()
+            try:
+                if channel == 'trading_signals':
+                    await self.signal_batcher.process(data)
+                elif channel == 'risk_alerts':
+                    await self.broadcast_risk_alert(data)
+                elif channel == 'portfolio_updates':
+                    await self.broadcast_portfolio_update(data)
+            except Exception:
+                logger.opt(exception=True).error("Error delivering {} notification", channel)
+            finally:
+                self.notification_queue.task_done()
+    
+    async def broadcast_signal_notification(self, signals: List[Dict[str, Any]]):
+        """Broadcast a batch of trading signals to subscribed users"""
+        # Get users who want signal notifications, once per batch
+        users, muted = await asyncio.gather(
+            self.get_signal_subscribers_cached(),
+            self.redis_client.smembers(MUTED_SIGNAL_USERS_KEY)
+        )
         
-        signal_text = f"""
-🎯 **NEW TRADING SIGNAL**
-
-🪙 **Token:** {signal_data['token_symbol']}
-📊 **Action:** {signal_data['action']}
-💰 **Price:** {format_price(signal_data['price'])}
-🎯 **Target:** {format_price(signal_data['target_price']) if signal_data['target_price'] else 'N/A'}
-🛡️ **Stop Loss:** {format_price(signal_data['stop_loss']) if signal_data['stop_loss'] else 'N/A'}
-⭐ **Confidence:** {signal_data['confidence']:.1%}
-
-🤖 **AI Analysis:** {signal_data['reasoning'][:100]}...
-        """
+        # Skip users who muted alerts so they don't cost a Telegram round-trip
+        if muted:
+            muted = {m.decode() if isinstance(m, bytes) else str(m) for m in muted}
+            users = [user for user in users if str(user['telegram_id']) not in muted]
         
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("🚀 Execute Trade", callback_data=f"execute_signal_{signal_data['id']}"),
-                InlineKeyboardButton("📊 Details", callback_data=f"signal_details_{signal_data['id']}")
-            ],
-            [InlineKeyboardButton("🔕 Disable Alerts", callback_data="disable_signal_alerts")]
-        ])
+        if len(signals) == 1:
+            signal_text, keyboard = self.build_signal_message(signals[0])
+        else:
+            signal_text, keyboard = self.build_signal_digest(signals)
         
-        for user in users:
+        # Sends are paced by the application's rate limiter
+        async def send_to_user(user):
             try:
                 await self.application.bot.send_message(
                     chat_id=user['telegram_id'],
                     text=signal_text,
-                    parse_mode=ParseMode.MARKDOWN,
+                    parse_mode=ParseMode.HTML,
                     reply_markup=keyboard
                 )
-            except Exception as e:
-                logger.error(f"Error sending signal to user {user['id']}: {e}")
+            except RetryAfter as e:
+                logger.warning("Telegram flood limit still hit for user {}, retry after {}s", user['id'], e.retry_after)
+            except Exception:
+                logger.opt(exception=True).error("Error sending signal to user {}", user['id'])
+        
+        await asyncio.gather(*(send_to_user(user) for user in users), return_exceptions=True)
+    
+    def build_signal_message(self, signal_data):
+        """Message and keyboard for a single trading signal"""
+        signal_text = SIGNAL_TEMPLATE(
+            token_symbol=esc(signal_data['token_symbol']),
+            action=esc(signal_data['action']),
+            price=format_price(signal_data['price']),
+            target_price=format_price(signal_data['target_price']) if signal_data.get('target_price') else 'N/A',
+            stop_loss=format_price(signal_data['stop_loss']) if signal_data.get('stop_loss') else 'N/A',
+            confidence=signal_data['confidence'],
+            reasoning=esc(reasoning_text(signal_data.get('reasoning'))[:100])
+        )
+        
+        keyboard = InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton("🚀 Execute Trade", callback_data=f"execute_signal_{signal_data['id']}"),
+                InlineKeyboardButton("📊 Details", callback_data=f"signal_details_{signal_data['id']}")
+            ],
+            DISABLE_SIGNAL_ALERTS_ROW
+        ])
+        
+        return signal_text, keyboard
+    
+    def build_signal_digest(self, signals):
+        """One aggregated message and keyboard for several signals"""
+        signal_text = f"🎯 <b>{len(signals)} NEW TRADING SIGNALS</b>\n\n"
+        keyboard_buttons = []
+        
+        for signal in signals:
+            action_emoji = "🚀" if signal['action'] in ['STRONG_BUY', 'BUY'] else "⚠️" if signal['action'] == 'HOLD' else "🔻"
+            signal_text += f"{action_emoji} <b>{esc(signal['token_symbol'])}</b> - {esc(signal['action'])}\n"
+            signal_text += f"   💰 Price: {format_price(signal['price'])}\n"
+            signal_text += f"   ⭐ Confidence: {signal['confidence']:.1%}\n\n"
+            keyboard_buttons.append([
+                InlineKeyboardButton(f"🚀 Execute {signal['token_symbol']}", callback_data=f"execute_signal_{signal['id']}")
+            ])
+        
+        keyboard_buttons.append(DISABLE_SIGNAL_ALERTS_ROW)
+        
+        return signal_text, InlineKeyboardMarkup(keyboard_buttons)
     
     async def run(self):
         """Start the Telegram bot"""
@@ -524,21 +868,30 @@ Withdrawals require identity verification for your protection.
         # Start polling for updates
         await self.application.updater.start_polling()
         
-        # Start notification listener
-        asyncio.create_task(self.start_notifications())
+        # Start notification delivery workers and the pub/sub listener
+        self.notification_workers = [
+            asyncio.create_task(self.notification_worker())
+            for _ in range(NOTIFICATION_WORKERS)
+        ]
+        self.notification_workers.append(asyncio.create_task(self.start_notifications()))
         
         logger.info("✅ Hydra Telegram Bot is running!")
         
-        # Keep running
-        while self.is_running:
-            await asyncio.sleep(1)
+        # Keep running until stop() is called
+        await self.stop_event.wait()
     
     async def stop(self):
         """Stop the Telegram bot"""
         self.is_running = False
+        self.stop_event.set()
+        for worker in self.notification_workers:
+            worker.cancel()
+        await self.signal_batcher.close()
         if self.application:
             await self.application.stop()
             await self.application.shutdown()
+        if self.http:
+            await self.http.aclose()
         logger.info("🛑 Hydra Telegram Bot stopped")
     
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -568,4 +921,7 @@ async def main():
     await bot.run()
 
 if __name__ == "__main__":
+    import uvloop
+    
+    uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Shared test setup
+Each service runs with its own directory as /app, so its modules import top-level
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path[:0] = [str(ROOT), str(ROOT / "ai_signal_engine"), str(ROOT / "telegram_bot")]
+
+# Shared packages mounted into the service images rather than kept in this repository
+DEPLOYED_PACKAGES = {
+    "core": ("core.database", "core.redis_client"),
+    "models": ("models.signal", "models.token"),
+    "services": (
+        "services.user_service", "services.trading_service", "services.portfolio_service",
+        "services.alert_service", "services.social_monitor", "services.technical_analyzer",
+    ),
+    "utils": ("utils.formatters", "utils.keyboards", "utils.token_analyzer"),
+}
+
+# Required settings without defaults
+for name in (
+    "DATABASE_URL", "REDIS_URL", "PRIVATE_KEY", "TREASURY_WALLET", "BOOMROACH_TOKEN_MINT",
+    "OPENAI_API_KEY", "TELEGRAM_BOT_TOKEN", "JWT_SECRET", "INTERNAL_API_KEY", "WEBHOOK_SECRET",
+):
+    os.environ.setdefault(name, "test")
+
+
+def install_deployed_stand_ins():
+    """Register mocks for deployed packages that aren't importable here"""
+    for package, modules in DEPLOYED_PACKAGES.items():
+        if importlib.util.find_spec(package) is not None:
+            continue
+        for name in (package, *modules):
+            sys.modules[name] = MagicMock(name=name)
+
+
+def load_service_module(service: str, name: str = "main"):
+    """Import a service module under a unique name (every service has a main.py)"""
+    install_deployed_stand_ins()
+    spec = importlib.util.spec_from_file_location(
+        f"{service}_{name}", ROOT / service / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def telegram_main():
+    """telegram_bot/main.py, skipped when the bot's requirements aren't installed"""
+    for requirement in ("telegram", "httpx", "loguru", "orjson", "pydantic"):
+        pytest.importorskip(requirement)
+    return load_service_module("telegram_bot")
@@ -0,0 +1,58 @@
+"""
+Smoke test for the bot's command and callback dispatch tables
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+
+@pytest.fixture
+def bot(telegram_main):
+    bot = telegram_main.HydraTelegramBot()
+    bot.application = telegram_main.Application.builder().token("123456:TEST").build()
+    asyncio.run(bot.register_handlers())
+    return bot
+
+
+def press(bot, data):
+    """Dispatch a button press and return the mocked query"""
+    query = SimpleNamespace(data=data, answer=AsyncMock(), edit_message_text=AsyncMock())
+    update = SimpleNamespace(callback_query=query, effective_user=SimpleNamespace(id=42))
+    asyncio.run(bot.handle_callback_query(update, None))
+    return query
+
+
+def test_dispatch_tables_cover_every_callback(telegram_main, bot):
+    assert set(bot.callback_handlers) == set(telegram_main.CALLBACK_HANDLERS)
+    assert [prefix for prefix, _ in bot.callback_prefix_handlers] == [
+        prefix for prefix, _ in telegram_main.CALLBACK_PREFIX_HANDLERS
+    ]
+
+    for data, name in telegram_main.CALLBACK_HANDLERS.items():
+        expected = getattr(bot, name, bot.callback_unavailable)
+        assert bot.callback_handlers[data] == expected
+
+
+def test_every_command_is_registered(telegram_main, bot):
+    commands = {
+        command
+        for handlers in bot.application.handlers.values()
+        for handler in handlers
+        for command in getattr(handler, "commands", ())
+    }
+
+    assert commands == {command for command, _ in telegram_main.COMMAND_HANDLERS}
+
+
+def test_unimplemented_buttons_answer_not_available(telegram_main, bot):
+    for data in ("main_menu", "execute_signal_abc123"):
+        query = press(bot, data)
+        query.edit_message_text.assert_awaited_once_with(telegram_main.FEATURE_UNAVAILABLE_TEXT)
+
+
+def test_unknown_button_answers_unknown_action(bot):
+    query = press(bot, "no_such_button")
+    query.edit_message_text.assert_awaited_once_with("❓ Unknown action. Please try again.")
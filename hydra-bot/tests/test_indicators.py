@@ -0,0 +1,192 @@
+"""
+Numba indicator kernels against plain NumPy references
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+pl = pytest.importorskip("polars")
+
+import indicators_numba as ind  # noqa: E402
+
+RNG = np.random.default_rng(7)
+CLOSE = 100.0 + np.cumsum(RNG.normal(0.0, 1.0, 200))
+HIGH = CLOSE + RNG.uniform(0.1, 1.0, 200)
+LOW = CLOSE - RNG.uniform(0.1, 1.0, 200)
+
+
+def ohlc(size=len(CLOSE)):
+    return {"open": CLOSE[:size], "high": HIGH[:size], "low": LOW[:size], "close": CLOSE[:size]}
+
+
+def ref_ema(values, span):
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(values)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+def ref_wilder(values, n):
+    """Wilder smoothing: simple mean of the first n values, then (prev * (n - 1) + x) / n"""
+    out = np.full(len(values) + 1, np.nan)
+    if len(values) < n:
+        return out
+    avg = values[:n].mean()
+    out[n] = avg
+    for i in range(n, len(values)):
+        avg = (avg * (n - 1) + values[i]) / n
+        out[i + 1] = avg
+    return out
+
+
+def ref_rsi(close, n=14):
+    change = np.diff(close)
+    avg_gain = ref_wilder(np.clip(change, 0.0, None), n)
+    avg_loss = ref_wilder(np.clip(-change, 0.0, None), n)
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def ref_atr(high, low, close, n=14):
+    prev = close[:-1]
+    tr = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - prev), np.abs(low[1:] - prev)])
+    return ref_wilder(tr, n)
+
+
+def ref_bbands(close, n=20, k=2.0):
+    lower = np.full(len(close), np.nan)
+    middle = np.full(len(close), np.nan)
+    upper = np.full(len(close), np.nan)
+    for i in range(n - 1, len(close)):
+        window = close[i - n + 1:i + 1]
+        middle[i] = window.mean()
+        lower[i] = middle[i] - k * window.std()
+        upper[i] = middle[i] + k * window.std()
+    return lower, middle, upper
+
+
+def test_ema_matches_reference():
+    np.testing.assert_allclose(ind.ema(CLOSE, 12), ref_ema(CLOSE, 12))
+
+
+def test_rsi_matches_reference():
+    np.testing.assert_allclose(ind.rsi_wilder(CLOSE, 14), ref_rsi(CLOSE, 14))
+
+
+def test_rsi_of_rising_prices_is_100():
+    rsi = ind.rsi_wilder(np.arange(1.0, 31.0), 14)
+    assert np.isnan(rsi[:14]).all()
+    np.testing.assert_allclose(rsi[14:], 100.0)
+
+
+def test_macd_matches_reference():
+    macd_line, signal_line, histogram = ind.macd(CLOSE, 12, 26, 9)
+    expected = ref_ema(CLOSE, 12) - ref_ema(CLOSE, 26)
+    np.testing.assert_allclose(macd_line, expected)
+    np.testing.assert_allclose(signal_line, ref_ema(expected, 9))
+    np.testing.assert_allclose(histogram, macd_line - signal_line)
+
+
+def test_bbands_match_reference():
+    for got, expected in zip(ind.bbands(CLOSE, 20, 2.0), ref_bbands(CLOSE, 20, 2.0)):
+        np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+
+def test_atr_matches_reference():
+    np.testing.assert_allclose(ind.atr(HIGH, LOW, CLOSE, 14), ref_atr(HIGH, LOW, CLOSE, 14))
+
+
+def test_short_inputs_are_all_nan():
+    close = CLOSE[:10]
+    assert np.isnan(ind.rsi_wilder(close, 14)).all()
+    assert np.isnan(ind.atr(HIGH[:10], LOW[:10], close, 14)).all()
+    assert all(np.isnan(band).all() for band in ind.bbands(close, 20, 2.0))
+    # EMA-based MACD is defined from the first bar
+    assert np.isfinite(ind.macd(close, 12, 26, 9)[0]).all()
+
+
+def test_empty_inputs_return_empty_arrays():
+    empty = np.empty(0, dtype=np.float64)
+    assert ind.ema(empty, 12).shape == (0,)
+    assert ind.rsi_wilder(empty, 14).shape == (0,)
+    assert all(out.shape == (0,) for out in ind.macd(empty, 12, 26, 9))
+    assert all(out.shape == (0,) for out in ind.bbands(empty, 20, 2.0))
+    assert ind.atr(empty, empty, empty, 14).shape == (0,)
+    assert all(out.shape == (0,) for out in ind.fused_indicators(empty, empty, empty))
+
+
+@pytest.mark.parametrize("size", [0, 1, 10, 30, len(CLOSE)])
+def test_fused_kernel_matches_individual_kernels(size):
+    close, high, low = CLOSE[:size], HIGH[:size], LOW[:size]
+    rsi, macd_line, signal_line, lower, middle, upper, atr = ind.fused_indicators(close, high, low)
+
+    expected_macd, expected_signal, _ = ind.macd(close, 12, 26, 9)
+    expected_lower, expected_middle, expected_upper = ind.bbands(close, 20, 2.0)
+
+    # fastmath lets the fused loop reorder float ops, so allow rounding drift
+    for got, expected in (
+        (rsi, ind.rsi_wilder(close, 14)),
+        (macd_line, expected_macd),
+        (signal_line, expected_signal),
+        (lower, expected_lower),
+        (middle, expected_middle),
+        (upper, expected_upper),
+        (atr, ind.atr(high, low, close, 14)),
+    ):
+        np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_compute_indicators_uses_fused_kernel(monkeypatch):
+    calls = []
+    fused = ind.fused_indicators
+    monkeypatch.setattr(ind, "fused_indicators", lambda *args: calls.append(args) or fused(*args))
+    ind.compute_indicators(pl.DataFrame(ohlc()))
+    assert len(calls) == 1
+
+
+def test_compute_indicators_reads_polars_frames():
+    values = ind.compute_indicators(pl.DataFrame(ohlc()))
+    assert values["rsi"] == pytest.approx(ref_rsi(CLOSE)[-1])
+    assert values["atr"] == pytest.approx(ref_atr(HIGH, LOW, CLOSE)[-1])
+    assert values["bb_middle"] == pytest.approx(CLOSE[-20:].mean())
+
+
+def test_compute_indicators_reads_pandas_frames():
+    pd = pytest.importorskip("pandas")
+    assert ind.compute_indicators(pd.DataFrame(ohlc())) == ind.compute_indicators(pl.DataFrame(ohlc()))
+
+
+def test_compute_indicators_on_empty_frame_is_all_nan():
+    values = ind.compute_indicators(pl.DataFrame(ohlc(0)))
+    assert set(values) == set(ind.INDICATOR_NAMES)
+    assert all(math.isnan(value) for value in values.values())
+
+
+def test_hourly_candles_aggregate_ticks():
+    start = datetime(2026, 1, 1)
+    ticks = pl.DataFrame({
+        "timestamp": [start + timedelta(minutes=20 * i) for i in (4, 0, 1, 2, 3)],
+        "price": [5.0, 1.0, 3.0, 2.0, 4.0],
+    })
+    candles = ind.hourly_candles(ticks)
+    assert candles["timestamp"].to_list() == [start, start + timedelta(hours=1)]
+    assert candles.select("open", "high", "low", "close").rows() == [(1.0, 3.0, 1.0, 2.0), (4.0, 5.0, 4.0, 5.0)]
+
+
+def test_technical_summary_maps_kernel_output():
+    summary = ind.technical_summary(pl.DataFrame(ohlc()))
+    values = ind.compute_indicators(pl.DataFrame(ohlc()))
+    assert summary["rsi"] == values["rsi"]
+    assert summary["macd_signal"] == ("bullish" if values["macd_histogram"] > 0 else "bearish")
+    expected = (CLOSE[-1] - values["bb_lower"]) / (values["bb_upper"] - values["bb_lower"])
+    assert summary["bollinger_position"] == pytest.approx(expected)
+
+
+def test_technical_summary_skips_indicators_without_history():
+    assert ind.technical_summary(pl.DataFrame(ohlc(0))) == {}
+    assert set(ind.technical_summary(pl.DataFrame(ohlc(10)))) == {"macd_signal"}
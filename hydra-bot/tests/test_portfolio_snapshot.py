@@ -0,0 +1,76 @@
+"""
+Portfolio snapshots must look the same whether or not Redis had them
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+
+class FakePipeline:
+    def __init__(self, store):
+        self.store = store
+        self.results = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.results.append(self.store.get(key))
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.results.append(True)
+
+    async def execute(self):
+        results, self.results = self.results, []
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.store)
+
+
+def snapshot_bot(telegram_main, n_positions):
+    bot = telegram_main.HydraTelegramBot()
+    bot.redis_client = FakeRedis()
+
+    async def summary(user_id):
+        return {"total_value": Decimal("1234.5678"), "updated_at": datetime(2026, 10, 15, 7)}
+
+    async def positions(user_id):
+        return [{"mint": f"mint{i}", "amount": Decimal("1.5")} for i in range(n_positions)]
+
+    bot.portfolio_service = SimpleNamespace(get_portfolio_summary=summary, get_active_positions=positions)
+    return bot
+
+
+def test_miss_and_hit_return_the_same_types(telegram_main):
+    bot = snapshot_bot(telegram_main, telegram_main.PORTFOLIO_CACHE_MIN_POSITIONS)
+
+    miss = asyncio.run(bot.get_portfolio_snapshot(42))
+    assert "portfolio:42" in bot.redis_client.store
+    hit = asyncio.run(bot.get_portfolio_snapshot(42))
+
+    assert miss == hit
+    portfolio, positions = miss
+    assert portfolio == {"total_value": 1234.5678, "updated_at": "2026-10-15T07:00:00"}
+    assert positions[0]["amount"] == 1.5
+
+
+def test_uncached_small_portfolio_is_json_typed(telegram_main):
+    bot = snapshot_bot(telegram_main, 1)
+
+    portfolio, positions = asyncio.run(bot.get_portfolio_snapshot(7))
+
+    assert bot.redis_client.store == {}
+    assert type(portfolio["total_value"]) is float
+    assert type(positions[0]["amount"]) is float
@@ -0,0 +1,71 @@
+"""
+Token budget for the AI analysis prompt
+"""
+
+import pytest
+
+pytest.importorskip("orjson")
+tiktoken = pytest.importorskip("tiktoken")
+
+from prompts import build_ai_messages, compact_value  # noqa: E402
+
+# Input tokens allowed for one single-token analysis request (system + user)
+PROMPT_TOKEN_CAP = 350
+
+TOKEN = {
+    'mint': 'DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263',
+    'symbol': 'BONK',
+    'name': 'Bonk',
+}
+
+PRICE_DATA = {
+    'price': 0.0000234567891,
+    'market_cap': 1534567890.123456,
+    'volume_24h': 98765432.10987,
+    'change_24h': -3.14159265,
+}
+
+TECHNICAL_DATA = {
+    'rsi': 54.321987,
+    'macd_signal': 'bullish',
+    'bollinger_position': 0.6789123,
+    'volume_profile': 'increasing',
+    'support_resistance': {'support': 0.0000211111, 'resistance': 0.0000259999},
+    'liquidity_risk': 0.2345678,
+    'volatility_risk': 0.7654321,
+}
+
+SOCIAL_DATA = {
+    'sentiment_score': 0.4567891,
+    'news_sentiment': 0.1234567,
+    'activity_score': 0.8912345,
+    'influencer_mentions': 12,
+    'smart_money_activity': 0.3456789,
+}
+
+
+@pytest.fixture(scope="module")
+def encoding():
+    # tiktoken downloads the BPE file on first use; offline runs without a cached copy skip
+    try:
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception as exc:
+        pytest.skip(f"gpt-4 encoding unavailable: {exc.__class__.__name__}")
+
+
+def test_single_token_prompt_stays_under_cap(encoding):
+    messages = build_ai_messages(TOKEN, PRICE_DATA, TECHNICAL_DATA, SOCIAL_DATA)
+
+    n_tokens = sum(len(encoding.encode(message["content"])) for message in messages)
+
+    assert n_tokens <= PROMPT_TOKEN_CAP, f"prompt uses {n_tokens} tokens, cap is {PROMPT_TOKEN_CAP}"
+
+
+def test_compact_value_rounds_numpy_scalars():
+    np = pytest.importorskip("numpy")
+    assert compact_value(np.float32(54.321987)) == 54.32
+    assert type(compact_value(np.float32(54.321987))) is float
+    assert compact_value(np.float64(0.0000234567891)) == 2.346e-05
+    assert compact_value(np.int64(12)) == 12
+    assert compact_value(True) is True
+    assert compact_value('bullish') == 'bullish'
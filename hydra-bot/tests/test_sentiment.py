@@ -0,0 +1,49 @@
+"""
+Vectorized lexicon sentiment scoring
+"""
+
+import pytest
+
+pytest.importorskip("scipy")
+pytest.importorskip("vaderSentiment")
+pytest.importorskip("textblob")
+
+import sentiment  # noqa: E402
+from sentiment import mean_sentiment, score_texts  # noqa: E402
+
+
+def test_ascii_texts_score_with_the_lexicon():
+    scores = score_texts(["this token is great, love it", "terrible rug pull, awful", "gm frens"])
+    assert scores.shape == (3,)
+    assert scores[0] > 0
+    assert scores[1] < 0
+    # No lexicon hits on plain ASCII is neutral, without a TextBlob pass
+    assert scores[2] == 0.0
+
+
+def test_mostly_non_ascii_text_falls_back_to_textblob(monkeypatch):
+    calls = []
+
+    class FakeBlob:
+        def __init__(self, text):
+            calls.append(text)
+            self.sentiment = type("Sentiment", (), {"polarity": 0.5})()
+
+    monkeypatch.setattr(sentiment, "TextBlob", FakeBlob)
+    texts = ["🚀🚀🚀 月へ", "bonk 🚀"]
+    scores = score_texts(texts)
+
+    assert sentiment.non_ascii_ratio(texts[0]) >= sentiment.NON_ASCII_FALLBACK_RATIO
+    assert sentiment.non_ascii_ratio(texts[1]) < sentiment.NON_ASCII_FALLBACK_RATIO
+    assert calls == [texts[0]]
+    assert scores.tolist() == [0.5, 0.0]
+
+
+def test_empty_batch():
+    assert score_texts([]).shape == (0,)
+    assert mean_sentiment([]) == 0.0
+
+
+def test_mean_sentiment_averages_the_batch():
+    texts = ["great", "awful"]
+    assert mean_sentiment(texts) == pytest.approx(score_texts(texts).mean())
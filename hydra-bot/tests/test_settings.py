@@ -0,0 +1,19 @@
+"""
+Defaults that change engine behaviour unless explicitly configured
+"""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from config.settings import Settings  # noqa: E402
+
+
+def test_openai_batch_mode_is_opt_in(monkeypatch):
+    monkeypatch.delenv("OPENAI_BATCH_ENABLED", raising=False)
+    assert Settings().OPENAI_BATCH_ENABLED is False
+
+
+def test_openai_batch_mode_can_be_enabled(monkeypatch):
+    monkeypatch.setenv("OPENAI_BATCH_ENABLED", "true")
+    assert Settings().OPENAI_BATCH_ENABLED is True
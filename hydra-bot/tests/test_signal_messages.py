@@ -0,0 +1,97 @@
+"""
+The bot must render exactly what the AI engine publishes on trading_signals
+"""
+
+import asyncio
+from enum import Enum
+from types import SimpleNamespace
+
+import orjson
+
+from signal_store import signal_to_payload
+
+BONK = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+WIF = "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm"
+
+
+class Engine(Enum):
+    AI_ANALYSIS = "AI_ANALYSIS"
+
+
+class Kind(Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+
+
+class Action(Enum):
+    STRONG_BUY = "STRONG_BUY"
+    SELL = "SELL"
+
+
+def engine_payload(mint, kind=Kind.BUY, action=Action.STRONG_BUY):
+    """A trading_signals message as broadcast_signals publishes it"""
+    signal = SimpleNamespace(
+        token_mint=mint,
+        engine=Engine.AI_ANALYSIS,
+        type=kind,
+        action=action,
+        confidence=0.87,
+        price=0.0000234,
+        target_price=0.00003,
+        stop_loss=None,
+        timeframe="short",
+        reasoning={
+            "ai_reasoning": "Breakout on rising volume",
+            "technical_factors": {"rsi": 61.2, "macd_signal": "bullish", "bollinger_position": 0.8},
+        },
+        metadata={},
+    )
+    return orjson.loads(signal_to_payload(signal, "2026-10-15T07:00:00+00:00"))
+
+
+def batched(telegram_main, payloads):
+    """Run payloads through SignalBatcher and return what reaches the broadcast"""
+    bot = telegram_main.HydraTelegramBot()
+    delivered = []
+
+    async def capture(signals):
+        delivered.extend(signals)
+
+    bot.broadcast_signal_notification = capture
+    asyncio.run(bot.signal_batcher.process_batch(payloads))
+    return bot, delivered
+
+
+def test_single_signal_message_renders_engine_payload(telegram_main):
+    bot, delivered = batched(telegram_main, [engine_payload(BONK)])
+
+    text, keyboard = bot.build_signal_message(delivered[0])
+
+    assert "Breakout on rising volume" in text
+    assert "STRONG_BUY" in text
+    assert BONK[:6] in text
+    assert keyboard is not None
+
+
+def test_digest_renders_engine_payloads(telegram_main):
+    payloads = [engine_payload(BONK), engine_payload(WIF, Kind.SELL, Action.SELL)]
+    bot, delivered = batched(telegram_main, payloads)
+
+    text, keyboard = bot.build_signal_digest(delivered)
+
+    assert "2 NEW TRADING SIGNALS" in text
+    assert BONK[:6] in text and WIF[:6] in text
+    assert keyboard is not None
+
+
+def test_batcher_keeps_latest_per_mint_and_skips_malformed(telegram_main):
+    first, latest = engine_payload(BONK), engine_payload(BONK, Kind.SELL, Action.SELL)
+    _, delivered = batched(telegram_main, [first, {"token_mint": WIF}, "garbage", latest])
+
+    assert [signal["action"] for signal in delivered] == ["SELL"]
+
+
+def test_reasoning_text_accepts_dict_or_str(telegram_main):
+    assert telegram_main.reasoning_text({"ai_reasoning": "why"}) == "why"
+    assert telegram_main.reasoning_text("why") == "why"
+    assert telegram_main.reasoning_text(None) == ""
@@ -0,0 +1,112 @@
+"""
+signals table rows must match the Prisma schema the backend migrates
+"""
+
+import re
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from types import SimpleNamespace
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from signal_store import SIGNAL_COLUMNS, SIGNAL_INSERT_SQL, signal_to_payload, signal_to_row
+
+SCHEMA = (Path(__file__).resolve().parents[1] / "backend" / "prisma" / "schema.prisma").read_text()
+
+
+class Engine(Enum):
+    AI_ANALYSIS = "AI_ANALYSIS"
+
+
+class Kind(Enum):
+    BUY = "BUY"
+
+
+class Action(Enum):
+    STRONG_BUY = "STRONG_BUY"
+
+
+SIGNAL = SimpleNamespace(
+    token_mint="DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263",
+    engine=Engine.AI_ANALYSIS,
+    type=Kind.BUY,
+    action=Action.STRONG_BUY,
+    confidence=0.87,
+    price=0.0000234,
+    target_price=Decimal("0.00003"),
+    stop_loss=None,
+    timeframe="short",
+    reasoning={"ai_reasoning": "Breakout on rising volume", "technical_factors": {"rsi": 61.2}},
+    metadata={"market_cap": 1535000000.0},
+)
+
+
+def signal_model_fields():
+    """(columns, required columns without a default) of model Signal"""
+    models = set(re.findall(r"^model (\w+)", SCHEMA, re.MULTILINE))
+    body = re.search(r"^model Signal \{(.*?)^\}", SCHEMA, re.MULTILINE | re.DOTALL).group(1)
+
+    columns, required = set(), set()
+    for line in body.splitlines():
+        match = re.match(r"\s*(\w+)\s+(\w+)(\??)(\[\])?(.*)", line)
+        if not match or match.group(2) in models:
+            continue
+        name, _, optional, _, attributes = match.groups()
+        columns.add(name)
+        if not optional and "@default" not in attributes and "@updatedAt" not in attributes:
+            required.add(name)
+    return columns, required
+
+
+def test_insert_columns_exist_in_schema():
+    columns, required = signal_model_fields()
+
+    assert set(SIGNAL_COLUMNS) <= columns
+    assert required <= set(SIGNAL_COLUMNS)
+
+
+def test_insert_statement_writes_signal_columns():
+    column_list = re.search(r"INSERT INTO signals \((.*?)\)", SIGNAL_INSERT_SQL, re.DOTALL).group(1)
+    written = [name.strip().strip('"') for name in column_list.split(",")]
+
+    assert written == list(SIGNAL_COLUMNS)
+
+
+def test_row_provides_every_bind_parameter():
+    row = signal_to_row(SIGNAL, datetime(2026, 10, 15, 7, 0))
+    params = set(re.findall(r"(?<!:):(\w+)", SIGNAL_INSERT_SQL))
+
+    assert params == set(row)
+
+
+def test_row_values_fit_column_types():
+    row = signal_to_row(SIGNAL, datetime(2026, 10, 15, 7, 0))
+
+    assert re.fullmatch(r"c[0-9a-z]{24}", row["id"])
+    assert row["id"] != signal_to_row(SIGNAL, datetime(2026, 10, 15, 7, 0))["id"]
+    assert row["confidence"] == Decimal("0.87")
+    assert row["target_price"] == Decimal("0.00003")
+    assert row["stop_loss"] is None
+    assert orjson.loads(row["reasoning"]) == SIGNAL.reasoning
+    assert orjson.loads(row["metadata"]) == SIGNAL.metadata
+
+
+def test_payload_carries_reasoning_dict():
+    payload = orjson.loads(signal_to_payload(SIGNAL, "2026-10-15T07:00:00+00:00"))
+
+    assert payload["token_mint"] == SIGNAL.token_mint
+    assert payload["action"] == "STRONG_BUY"
+    assert payload["target_price"] == 0.00003
+    assert payload["reasoning"] == SIGNAL.reasoning
+
+
+def test_sqlalchemy_statement_binds_row_keys():
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    statement = sqlalchemy.text(SIGNAL_INSERT_SQL)
+    row = signal_to_row(SIGNAL, datetime(2026, 10, 15, 7, 0))
+
+    assert set(statement.compile().params) == set(row)
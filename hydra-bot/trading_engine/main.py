@@ -6,16 +6,20 @@ Advanced Solana trading system with AI signals and risk management
 import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
+import httpx
+import orjson
+import redis.asyncio as aioredis
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from loguru import logger
-from prometheus_client import make_asgi_app, Counter, Histogram, Gauge
+from prometheus_client import make_asgi_app, Counter, Gauge
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
@@ -49,12 +53,46 @@ if settings.SENTRY_DSN:
         environment=settings.ENVIRONMENT
     )
 
-# Prometheus metrics
+# Prometheus metrics (endpoint is the route template, keeping label cardinality bounded)
 REQUEST_COUNT = Counter('trading_engine_requests_total', 'Total requests', ['method', 'endpoint'])
-REQUEST_DURATION = Histogram('trading_engine_request_duration_seconds', 'Request duration')
 ACTIVE_TRADES = Gauge('trading_engine_active_trades', 'Number of active trades')
 PORTFOLIO_VALUE = Gauge('trading_engine_portfolio_value_usd', 'Total portfolio value in USD')
 
+class RequestMetricsMiddleware:
+    """Counts requests per route template as a plain ASGI wrapper"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # FastAPI stores the matched route in the scope during routing
+            route = scope.get("route")
+            REQUEST_COUNT.labels(scope["method"], route.path if route else "unmatched").inc()
+
+class SelectiveGZipMiddleware:
+    """GZip for API responses, bypassed for the metrics scrape and WebSocket routes"""
+    
+    def __init__(self, app, excluded_prefixes=("/metrics", "/api/v1/ws"), **gzip_options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_options)
+        self.excluded_prefixes = excluded_prefixes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].startswith(self.excluded_prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+# Process start, for /status uptime
+STARTED_AT = time.monotonic()
+
 # Global service instances
 database: Database = None
 redis_client: RedisClient = None
@@ -63,6 +101,15 @@ jupiter_service: JupiterService = None
 trading_service: TradingService = None
 risk_service: RiskService = None
 portfolio_service: PortfolioService = None
+quote_client: httpx.AsyncClient = None
+redis_pool: aioredis.ConnectionPool = None
+redis_cache: aioredis.Redis = None
+background_tasks = set()
+
+async def init_step(label: str, step):
+    """Await one startup step and log when it completes"""
+    await step
+    logger.info(f"✅ {label}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -74,29 +121,42 @@ async def lifespan(app: FastAPI):
         # Initialize core services
         global database, redis_client, solana_client
         global jupiter_service, trading_service, risk_service, portfolio_service
+        global quote_client, redis_pool, redis_cache
         
-        # Database connection
+        # Construct clients; their connections are opened concurrently below
         database = Database(settings.DATABASE_URL)
-        await database.connect()
-        logger.info("✅ Database connected")
         
-        # Redis connection
-        redis_client = RedisClient(settings.REDIS_URL)
-        await redis_client.connect()
-        logger.info("✅ Redis connected")
+        # Redis connection, with one connection pool shared across the app
+        redis_pool = aioredis.ConnectionPool.from_url(
+            settings.REDIS_URL, max_connections=64, decode_responses=False
+        )
+        redis_cache = aioredis.Redis(connection_pool=redis_pool)
+        app.state.redis = redis_cache
+        redis_client = RedisClient(settings.REDIS_URL, connection_pool=redis_pool)
         
         # Solana blockchain connection
         solana_client = SolanaClient(
             rpc_url=settings.SOLANA_RPC_URL,
             ws_url=settings.SOLANA_WS_URL
         )
-        await solana_client.connect()
-        logger.info("✅ Solana client connected")
+        
+        # Shared HTTP/2 client so concurrent Jupiter quotes multiplex over one TLS session
+        quote_client = httpx.AsyncClient(
+            base_url=settings.JUPITER_API_URL,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=httpx.Timeout(2.0)
+        )
+        app.state.quote_client = quote_client
+        
+        await asyncio.gather(
+            init_step("Database connected", database.connect()),
+            init_step("Redis connected", redis_client.connect()),
+            init_step("Solana client connected", solana_client.connect())
+        )
         
         # Jupiter aggregator service
-        jupiter_service = JupiterService(solana_client)
-        await jupiter_service.initialize()
-        logger.info("✅ Jupiter service initialized")
+        jupiter_service = JupiterService(solana_client, quote_client=quote_client)
         
         # Core trading services
         trading_service = TradingService(
@@ -105,8 +165,6 @@ async def lifespan(app: FastAPI):
             solana_client=solana_client,
             jupiter_service=jupiter_service
         )
-        await trading_service.initialize()
-        logger.info("✅ Trading service initialized")
         
         # Risk management service
         risk_service = RiskService(
@@ -114,19 +172,31 @@ async def lifespan(app: FastAPI):
             redis_client=redis_client,
             trading_service=trading_service
         )
-        await risk_service.initialize()
-        logger.info("✅ Risk service initialized")
         
         # Portfolio tracking service
         portfolio_service = PortfolioService(
             database=database,
             solana_client=solana_client
         )
-        await portfolio_service.initialize()
-        logger.info("✅ Portfolio service initialized")
+        
+        # Trading needs Jupiter and risk needs trading; portfolio only needs the connections
+        async def init_trading_chain():
+            await init_step("Jupiter service initialized", jupiter_service.initialize())
+            await init_step("Trading service initialized", trading_service.initialize())
+            await init_step("Risk service initialized", risk_service.initialize())
+        
+        await asyncio.gather(
+            init_trading_chain(),
+            init_step("Portfolio service initialized", portfolio_service.initialize())
+        )
+        
+        # Start tasks eagerly where the runtime supports it (Python 3.12+)
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory:
+            asyncio.get_running_loop().set_task_factory(eager_task_factory)
         
         # Start background tasks
-        asyncio.create_task(start_background_tasks())
+        await start_background_tasks()
         
         logger.info("🎯 Hydra Bot Trading Engine fully initialized!")
         
@@ -140,6 +210,11 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down Hydra Bot Trading Engine...")
     
     try:
+        # Stop background loops before the services they use
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        
         # Stop services gracefully
         if trading_service:
             await trading_service.shutdown()
@@ -149,10 +224,14 @@ async def lifespan(app: FastAPI):
             await portfolio_service.shutdown()
         if jupiter_service:
             await jupiter_service.shutdown()
+        if quote_client:
+            await quote_client.aclose()
         if solana_client:
             await solana_client.disconnect()
         if redis_client:
             await redis_client.disconnect()
+        if redis_pool:
+            await redis_pool.disconnect()
         if database:
             await database.disconnect()
             
@@ -168,11 +247,15 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Latest gauge values, refreshed by update_metrics and read by /health
+app.state.metrics_snapshot = {"active_trades": 0, "portfolio_value": 0}
+
 # Add middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -184,6 +267,7 @@ app.add_middleware(
 # Add custom middleware
 app.add_middleware(AuthMiddleware)
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Setup exception handlers
 setup_exception_handlers(app)
@@ -200,28 +284,31 @@ app.include_router(risk.router, prefix="/api/v1/risk", tags=["Risk Management"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
 app.include_router(websocket.router, prefix="/api/v1/ws", tags=["WebSocket"])
 
+# The root payload only depends on settings, so encode it once
+ROOT_BODY = orjson.dumps({
+    "name": "Hydra Bot Trading Engine",
+    "version": "1.0.0",
+    "status": "operational",
+    "description": "Advanced Solana trading system for BoomRoach ecosystem",
+    "features": [
+        "AI-powered signal generation",
+        "Lightning-fast execution (2-3 seconds)",
+        "Comprehensive risk management",
+        "Jupiter aggregator integration",
+        "Real-time portfolio tracking"
+    ],
+    "engines": {
+        "sniper": settings.SNIPER_ENABLED,
+        "reentry": settings.REENTRY_ENABLED,
+        "ai_signals": settings.AI_SIGNALS_ENABLED,
+        "guardian": settings.GUARDIAN_ENABLED
+    }
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "name": "Hydra Bot Trading Engine",
-        "version": "1.0.0",
-        "status": "operational",
-        "description": "Advanced Solana trading system for BoomRoach ecosystem",
-        "features": [
-            "AI-powered signal generation",
-            "Lightning-fast execution (2-3 seconds)",
-            "Comprehensive risk management",
-            "Jupiter aggregator integration",
-            "Real-time portfolio tracking"
-        ],
-        "engines": {
-            "sniper": settings.SNIPER_ENABLED,
-            "reentry": settings.REENTRY_ENABLED,
-            "ai_signals": settings.AI_SIGNALS_ENABLED,
-            "guardian": settings.GUARDIAN_ENABLED
-        }
-    }
+    return Response(ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
@@ -239,28 +326,25 @@ async def health_check():
         # Overall health status
         healthy = db_healthy and redis_healthy and solana_healthy
         
-        return {
+        return Response(orjson.dumps({
             "status": "healthy" if healthy else "unhealthy",
-            "timestamp": asyncio.get_event_loop().time(),
+            "timestamp": time.monotonic(),
             "services": {
                 "database": "ok" if db_healthy else "error",
                 "redis": "ok" if redis_healthy else "error",
                 "solana": "ok" if solana_healthy else "error"
             },
-            "metrics": {
-                "active_trades": ACTIVE_TRADES._value._value,
-                "portfolio_value": PORTFOLIO_VALUE._value._value
-            }
-        }
+            "metrics": app.state.metrics_snapshot
+        }), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": asyncio.get_event_loop().time()
+                "timestamp": time.monotonic()
             }
         )
 
@@ -268,14 +352,16 @@ async def health_check():
 async def status():
     """Detailed status endpoint"""
     try:
-        trading_stats = await trading_service.get_stats() if trading_service else {}
-        risk_stats = await risk_service.get_stats() if risk_service else {}
-        portfolio_stats = await portfolio_service.get_stats() if portfolio_service else {}
+        trading_stats, risk_stats, portfolio_stats = await asyncio.gather(
+            trading_service.get_stats() if trading_service else asyncio.sleep(0, {}),
+            risk_service.get_stats() if risk_service else asyncio.sleep(0, {}),
+            portfolio_service.get_stats() if portfolio_service else asyncio.sleep(0, {})
+        )
         
         return {
             "engine": "Hydra Bot Trading Engine",
             "version": "1.0.0",
-            "uptime": asyncio.get_event_loop().time(),
+            "uptime": time.monotonic() - STARTED_AT,
             "environment": settings.ENVIRONMENT,
             "trading": trading_stats,
             "risk": risk_stats,
@@ -292,43 +378,73 @@ async def status():
         logger.error(f"Status check failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def spawn_background_task(coro, name: str):
+    """Start a tracked background task whose failure is logged as soon as it happens"""
+    task = asyncio.create_task(coro, name=name)
+    background_tasks.add(task)
+    task.add_done_callback(on_background_task_done)
+
+def on_background_task_done(task: asyncio.Task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"❌ Background task {task.get_name()} failed: {task.exception()}")
+
 async def start_background_tasks():
     """Start background monitoring and maintenance tasks"""
     logger.info("🔄 Starting background tasks...")
     
     # Start portfolio monitoring
     if portfolio_service:
-        asyncio.create_task(portfolio_service.start_monitoring())
+        spawn_background_task(portfolio_service.start_monitoring(), "portfolio_monitoring")
     
     # Start risk monitoring
     if risk_service:
-        asyncio.create_task(risk_service.start_monitoring())
+        spawn_background_task(risk_service.start_monitoring(), "risk_monitoring")
     
     # Start trading engine if enabled
     if trading_service and settings.TRADING_ENABLED:
-        asyncio.create_task(trading_service.start_engines())
+        spawn_background_task(trading_service.start_engines(), "trading_engines")
     
     # Update metrics periodically
-    asyncio.create_task(update_metrics())
+    spawn_background_task(update_metrics(), "update_metrics")
     
     logger.info("✅ Background tasks started")
 
 async def update_metrics():
     """Update Prometheus metrics periodically"""
+    started = time.monotonic()
+    
     while True:
         try:
-            if trading_service:
-                stats = await trading_service.get_stats()
-                ACTIVE_TRADES.set(stats.get("active_trades", 0))
+            trading_stats, portfolio_stats = await asyncio.gather(
+                trading_service.get_stats() if trading_service else asyncio.sleep(0, {}),
+                portfolio_service.get_stats() if portfolio_service else asyncio.sleep(0, {})
+            )
             
+            snapshot = app.state.metrics_snapshot
+            if trading_service:
+                snapshot = {**snapshot, "active_trades": int(trading_stats.get("active_trades") or 0)}
+                ACTIVE_TRADES.set(snapshot["active_trades"])
             if portfolio_service:
-                stats = await portfolio_service.get_stats()
-                PORTFOLIO_VALUE.set(stats.get("total_value_usd", 0))
+                # Plain numbers only: /health serializes the snapshot with orjson
+                snapshot = {**snapshot, "portfolio_value": float(portfolio_stats.get("total_value_usd") or 0)}
+                PORTFOLIO_VALUE.set(snapshot["portfolio_value"])
+            
+            # Swap in a new dict so /health never sees a half-updated snapshot
+            app.state.metrics_snapshot = snapshot
+            
+            # Publish the snapshot for other services in one round-trip
+            if redis_cache:
+                async with redis_cache.pipeline(transaction=False) as pipe:
+                    pipe.set("trading_engine:active_trades", snapshot["active_trades"])
+                    pipe.set("trading_engine:portfolio_value_usd", snapshot["portfolio_value"])
+                    await pipe.execute()
                 
         except Exception as e:
             logger.error(f"Error updating metrics: {e}")
         
-        await asyncio.sleep(30)  # Update every 30 seconds
+        # Update every 30 seconds, aligned to the first tick so slow polls don't drift
+        await asyncio.sleep(30 - (time.monotonic() - started) % 30)
 
 # Dependency injection
 def get_database() -> Database:
@@ -337,9 +453,15 @@ def get_database() -> Database:
 def get_redis() -> RedisClient:
     return redis_client
 
+def get_redis_cache() -> aioredis.Redis:
+    return redis_cache
+
 def get_solana_client() -> SolanaClient:
     return solana_client
 
+def get_quote_client() -> httpx.AsyncClient:
+    return quote_client
+
 def get_trading_service() -> TradingService:
     return trading_service
 
@@ -350,11 +472,15 @@ def get_portfolio_service() -> PortfolioService:
     return portfolio_service
 
 if __name__ == "__main__":
-    # Development server
+    # Development server; in production run multiple workers with
+    # gunicorn -k uvicorn.workers.UvicornWorker -w $((2 * $(nproc) + 1)) main:app
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=settings.ENVIRONMENT == "development",
-        log_level="info"
+        log_level="info",
+        access_log=False
     )
\ No newline at end of file